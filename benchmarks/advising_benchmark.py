@@ -0,0 +1,133 @@
+# benchmarks/advising_benchmark.py
+#
+# Time every stage of the advising pipeline on synthetic students and
+# report p50/p95/p99 latency and throughput, optionally against scaled-up
+# synthetic catalogs to expose super-linear behaviour.
+#
+#   python benchmarks/advising_benchmark.py --students 2000 --scale 1 10 100
+#   python benchmarks/advising_benchmark.py --check-engine
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from advising import AdvisingPipeline, recommend
+from catalog import load_catalog
+from synthetic import generate_students, scale_catalog
+
+STAGES = ("load", "filter", "sort", "select", "explain")
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(fraction * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def time_student(pipeline, student, selection="greedy"):
+    """Run the pipeline stage by stage, returning seconds spent per stage"""
+    timings = {}
+
+    start = time.perf_counter()
+    catalog = pipeline._pin_catalog()
+    context = pipeline._build_student_context(
+        student["cgpa"], student["passed"], student["failed"], student["semester"]
+    )
+    timings["load"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    available = pipeline._get_available_courses(catalog.courses, student["semester"])
+    eligible = pipeline._filter_eligible_courses(available, context)
+    timings["filter"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ranked = pipeline._sort_courses_by_priority(eligible, context)
+    timings["sort"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if selection == "optimal":
+        selected = pipeline._select_courses_optimal(ranked, context)
+    else:
+        selected = pipeline._select_courses_within_limit(ranked, context.credit_limit)
+    timings["select"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pipeline._generate_explanations(selected, context)
+    timings["explain"] = time.perf_counter() - start
+    return timings
+
+
+def run_scale(factor, students, seed, selection):
+    start = time.perf_counter()
+    catalog = scale_catalog(factor)
+    build_seconds = time.perf_counter() - start
+
+    pipeline = AdvisingPipeline()
+    pipeline.catalog = catalog
+    profiles = list(generate_students(students, seed, catalog))
+
+    samples = {stage: [] for stage in STAGES}
+    totals = []
+    wall_start = time.perf_counter()
+    for student in profiles:
+        timings = time_student(pipeline, student, selection)
+        for stage, seconds in timings.items():
+            samples[stage].append(seconds)
+        totals.append(sum(timings.values()))
+    wall = time.perf_counter() - wall_start
+
+    print(f"\nCatalog x{factor}: {len(catalog.courses)} courses "
+          f"(prepared in {build_seconds * 1000:.1f} ms), {students} students")
+    print(f"  {'stage':<8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for stage in STAGES + ("total",):
+        values = sorted(samples[stage] if stage != "total" else totals)
+        print(f"  {stage:<8} " + " ".join(
+            f"{percentile(values, q) * 1000:>9.3f}" for q in (0.50, 0.95, 0.99)
+        ))
+    print(f"  throughput: {students / wall:,.0f} students/s")
+
+
+def check_engine(students, seed):
+    """Compare the fast path with the experta engine path on synthetic students"""
+    from inference_engine import advise_with_engine
+
+    mismatches = 0
+    for student in generate_students(students, seed):
+        args = (student["cgpa"], student["passed"], student["failed"], student["semester"])
+        if recommend(*args, use_cache=False) != advise_with_engine(*args):
+            mismatches += 1
+    print(f"Engine equivalence: {students - mismatches}/{students} identical")
+    return 1 if mismatches else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark the advising pipeline on synthetic students."
+    )
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scale", type=int, nargs="+", default=[1],
+                        help="Catalog scale factors to run, e.g. 1 10 100")
+    parser.add_argument("--selection", choices=("greedy", "optimal"), default="greedy")
+    parser.add_argument("--check-engine", action="store_true",
+                        help="Verify the experta path returns identical results instead")
+    args = parser.parse_args(argv)
+
+    if args.check_engine:
+        return check_engine(args.students, args.seed)
+
+    start = time.perf_counter()
+    load_catalog()
+    print(f"Cold catalog load from JSON: {(time.perf_counter() - start) * 1000:.1f} ms")
+    for factor in args.scale:
+        run_scale(factor, args.students, args.seed, args.selection)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+# benchmarks/catalog_benchmark.py
+#
+# Cold-start cost of loading the catalog from the JSON sources versus the
+# compiled snapshot. Every measurement runs in a fresh interpreter, as a
+# new Streamlit process or pool worker would, against the real catalog
+# and scaled-up synthetic copies written out as pretty-printed JSON.
+#
+#   python benchmarks/catalog_benchmark.py --scale 1 10 100 --repeat 7
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import catalog
+from synthetic import _thaw, scale_catalog
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Runs in the child interpreter; prints one JSON line of measurements
+CHILD = '''
+import json, sys, time
+start = time.perf_counter()
+config = json.loads(sys.argv[1])
+if config["trace"]:
+    import tracemalloc
+    tracemalloc.start()
+import catalog
+catalog.COURSE_SOURCES = [tuple(source) for source in config["sources"]]
+catalog.POLICIES_PATH = config["policies"]
+catalog.STUDY_PLAN_PATH = config["study_plan"]
+loaded = time.perf_counter()
+result = catalog.load_catalog(config["snapshot"])
+done = time.perf_counter()
+out = {"import_ms": (loaded - start) * 1000, "load_ms": (done - loaded) * 1000,
+       "courses": len(result.courses)}
+if config["trace"]:
+    out["retained_kb"], out["peak_kb"] = (v / 1024 for v in tracemalloc.get_traced_memory())
+try:
+    import resource
+    out["rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+except ImportError:
+    pass
+print(json.dumps(out))
+'''
+
+
+def write_sources(scaled, directory):
+    """Write a catalog out as one pretty-printed JSON file per course type"""
+    by_type = {}
+    for code, course in scaled.courses.items():
+        by_type.setdefault(course["type"], []).append(_thaw(course))
+
+    sources = []
+    for _, course_type in catalog.COURSE_SOURCES:
+        path = os.path.join(directory, f"{course_type}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(by_type.get(course_type, []), f, indent=2, ensure_ascii=False)
+        sources.append((path, course_type))
+
+    policies = os.path.join(directory, "Policies.json")
+    study_plan = os.path.join(directory, "StudyPlan.json")
+    for path, value in ((policies, scaled.policies), (study_plan, scaled.study_plan)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(_thaw(value), f, indent=2, ensure_ascii=False)
+    return sources, policies, study_plan
+
+
+def run_child(config):
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, json.dumps(config)],
+        env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+def bench_scale(factor, repeat):
+    scaled = scale_catalog(factor)
+    with tempfile.TemporaryDirectory() as directory:
+        sources, policies, study_plan = write_sources(scaled, directory)
+        snapshot = os.path.join(directory, "catalog.snapshot")
+
+        # compile_snapshot reads the module-level paths, so point them here
+        saved = catalog.COURSE_SOURCES, catalog.POLICIES_PATH, catalog.STUDY_PLAN_PATH
+        catalog.COURSE_SOURCES, catalog.POLICIES_PATH, catalog.STUDY_PLAN_PATH = sources, policies, study_plan
+        try:
+            catalog.compile_snapshot(snapshot)
+        finally:
+            catalog.COURSE_SOURCES, catalog.POLICIES_PATH, catalog.STUDY_PLAN_PATH = saved
+
+        json_bytes = sum(os.path.getsize(path) for path, _ in sources)
+        json_bytes += os.path.getsize(policies) + os.path.getsize(study_plan)
+        print(f"\nScale {factor}x: {len(scaled.courses)} courses, "
+              f"JSON {json_bytes / 1024:.0f} KB, snapshot {os.path.getsize(snapshot) / 1024:.0f} KB")
+        print(f"{'source':<10}{'load p50 ms':>13}{'import ms':>11}{'rss MB':>9}{'peak KB':>10}{'kept KB':>10}")
+
+        for name, path in (("json", None), ("snapshot", snapshot)):
+            config = {"sources": sources, "policies": policies,
+                      "study_plan": study_plan, "snapshot": path, "trace": False}
+            runs = [run_child(config) for _ in range(repeat)]
+            traced = run_child(dict(config, trace=True))
+            print(f"{name:<10}"
+                  f"{statistics.median(r['load_ms'] for r in runs):>13.2f}"
+                  f"{statistics.median(r['import_ms'] for r in runs):>11.2f}"
+                  f"{statistics.median(r.get('rss_mb', 0.0) for r in runs):>9.1f}"
+                  f"{traced['peak_kb']:>10.0f}"
+                  f"{traced['retained_kb']:>10.0f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Catalog cold-start benchmark.")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10, 100],
+                        help="Catalog size multipliers to test")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Fresh processes per measurement")
+    args = parser.parse_args(argv)
+
+    for factor in args.scale:
+        bench_scale(factor, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
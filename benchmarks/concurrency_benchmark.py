@@ -0,0 +1,91 @@
+# benchmarks/concurrency_benchmark.py
+#
+# Throughput and latency of the rule-engine path with 1, 8 and 32
+# simultaneous advising requests, using pooled engines (advise_with_engine)
+# versus building a new CourseAdvisor for every request. Reports the
+# pool's wait-time counters and checks every pooled result against the
+# direct pipeline.
+#
+#   python benchmarks/concurrency_benchmark.py --requests 2000 --threads 1 8 32 --pool-size 8
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from advising import recommend, recommendation_row
+from advising_benchmark import percentile
+from inference_engine import (
+    DEFAULT_POOL_SIZE, Course, CourseAdvisor, StudentProfile, advise_with_engine,
+    configure_engine_pool, engine_pool_info
+)
+from synthetic import generate_students
+
+
+def advise_fresh(cgpa, passed, failed, semester):
+    """A new engine per request, as before pooling"""
+    engine = CourseAdvisor()
+    engine.reset()
+    engine.declare(StudentProfile(cgpa=cgpa, passed=passed, failed=failed, semester=semester))
+    engine.run()
+    catalog = engine._get_catalog()
+    selected = [catalog.courses[f["code"]] for f in engine.facts.values() if isinstance(f, Course)]
+    return ([recommendation_row(course, catalog) for course in selected],
+            engine._generate_explanations(selected, engine._context))
+
+
+def run(advise, requests, threads):
+    """Latencies of every request and the wall time for all of them"""
+    def timed(args):
+        start = time.perf_counter()
+        result = advise(*args)
+        return result, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        outcomes = list(executor.map(timed, requests))
+    return outcomes, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent rule-engine advising benchmark.")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--pool-size", type=int, default=DEFAULT_POOL_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    requests = [
+        (s["cgpa"], s["passed"], s["failed"], s["semester"])
+        for s in generate_students(args.requests, args.seed)
+    ]
+    expected = [recommend(*r, use_cache=False) for r in requests]
+
+    mismatches = 0
+    print(f"{args.requests} requests, pool size {args.pool_size}")
+    print(f"{'threads':<9}{'path':<8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'waits':>8}{'mean wait ms':>14}{'max wait ms':>13}")
+    for threads in args.threads:
+        for name, advise in (("fresh", advise_fresh), ("pooled", advise_with_engine)):
+            configure_engine_pool(args.pool_size)
+            outcomes, wall = run(advise, requests, threads)
+            latencies = sorted(seconds for _, seconds in outcomes)
+            if name == "pooled":
+                mismatches += sum(1 for (result, _), want in zip(outcomes, expected) if result != want)
+                info = engine_pool_info()
+                waits = f"{info['waits']:>8}{info['mean_wait_ms']:>14.3f}{info['max_wait_ms']:>13.2f}"
+            else:
+                waits = f"{'-':>8}{'-':>14}{'-':>13}"
+            print(f"{threads:<9}{name:<8}{len(requests) / wall:>9,.0f}"
+                  + "".join(f"{percentile(latencies, q) * 1000:>9.2f}" for q in (0.50, 0.95, 0.99))
+                  + waits)
+    print(f"\npooled results identical to the direct pipeline: {args.requests * len(args.threads) - mismatches}"
+          f"/{args.requests * len(args.threads)}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+# benchmarks/eligibility_benchmark.py
+#
+# Compare three ways of finding the courses a student may take next:
+# scanning string memberships course by course (the original filter), the
+# per-student bitmask filter the pipeline now uses, and the cohort-wide
+# eligible_course_masks() used to evaluate many students at once. All
+# three must agree for every student.
+#
+#   python benchmarks/eligibility_benchmark.py --students 2000 --scale 1 10 100
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from advising import AdvisingPipeline, eligible_course_masks
+from synthetic import SEMESTERS, generate_students, scale_catalog
+
+
+def scan_eligible(catalog, passed, semester):
+    """The original filter: list and string membership tests"""
+    eligible = []
+    for course in catalog.courses.values():
+        if semester not in course.semester_offered or course.code in passed:
+            continue
+        if all(prereq in passed for prereq in course.prerequisites):
+            eligible.append(course.code)
+    return eligible
+
+
+def bitset_eligible(pipeline, catalog, context):
+    available = pipeline._get_available_courses(catalog.courses, context.semester)
+    return [course.code for course in pipeline._filter_eligible_courses(available, context)]
+
+
+def bench_scale(factor, count):
+    catalog = scale_catalog(factor)
+    students = list(generate_students(count, seed=factor, catalog=catalog))
+    pipeline = AdvisingPipeline()
+    pipeline.catalog = catalog
+    pipeline._pin_catalog()
+    # Only the filters are timed, not building the per-student inputs
+    passed_sets = [frozenset(s["passed"]) for s in students]
+    contexts = [
+        pipeline._build_student_context(s["cgpa"], s["passed"], s["failed"], s["semester"])
+        for s in students
+    ]
+
+    start = time.perf_counter()
+    scanned = [scan_eligible(catalog, passed, s["semester"]) for passed, s in zip(passed_sets, students)]
+    scan_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bitset = [bitset_eligible(pipeline, catalog, context) for context in contexts]
+    bitset_seconds = time.perf_counter() - start
+
+    # The cohort version handles one semester at a time
+    cohort = [None] * len(students)
+    cohort_seconds = 0.0
+    for semester in SEMESTERS:
+        indexes = [i for i, s in enumerate(students) if s["semester"] == semester]
+        start = time.perf_counter()
+        masks = eligible_course_masks([passed_sets[i] for i in indexes], semester, catalog)
+        cohort_seconds += time.perf_counter() - start
+        for i, mask in zip(indexes, masks):
+            cohort[i] = [course.code for course in catalog.courses_in_mask(mask)]
+
+    mismatches = sum(1 for a, b, c in zip(scanned, bitset, cohort) if not a == b == c)
+    print(f"\nScale {factor}x: {len(catalog.courses)} courses, {count} students, "
+          f"{mismatches} mismatches")
+    for name, seconds in (("scan", scan_seconds), ("bitset", bitset_seconds), ("cohort", cohort_seconds)):
+        print(f"  {name:<8}{seconds / count * 1e6:>10.1f} us/student"
+              f"{scan_seconds / seconds:>8.1f}x")
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Eligibility filter benchmark.")
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10, 100],
+                        help="Catalog size multipliers to test")
+    args = parser.parse_args(argv)
+
+    mismatches = sum(bench_scale(factor, args.students) for factor in args.scale)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+# benchmarks/import_benchmark.py
+#
+# Cold-start import profile of the Streamlit app, as a regression check.
+# Each fresh interpreter runs with -X importtime and imports the modules
+# that src/app.py imports at load time, read from its import statements.
+# Every module loaded is attributed to the app import that pulled it in,
+# so streamlit's own cost (which includes pandas and pyarrow on 1.14) is
+# reported apart from the app's. Prints the cumulative time of each import
+# and the slowest modules loaded. Exits non-zero if the app's own imports
+# load a heavy dependency that should load lazily (reportlab, experta,
+# pandas), or if they exceed --max-ms. Without streamlit installed only
+# the app's own imports are measured.
+#
+#   python benchmarks/import_benchmark.py --repeat 5 --max-ms 150
+
+import argparse
+import ast
+import importlib.util
+import os
+import re
+import subprocess
+import sys
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+APP = os.path.join(SRC, 'app.py')
+
+# Loaded only when a report is rendered or the rule engine is used
+LAZY = ("reportlab", "experta", "pandas")
+
+# Third-party framework the app runs in; its imports are not the app's
+FRAMEWORK = "streamlit"
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def app_imports(path=APP):
+    """Top-level modules src/app.py imports at load time, in order"""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def profile(modules):
+    """({module: (self us, cumulative us)}, {module: import that loaded it}) for one cold interpreter"""
+    code = f"import sys; sys.path.insert(0, {SRC!r})\n" + "\n".join(f"import {m}" for m in modules)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, check=True)
+    times = {}
+    owners = {}
+    pending = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        times[name] = (int(match.group(1)), int(match.group(2)))
+        pending.append(name)
+        # A module's line follows those of everything it imported
+        if len(match.group(3)) == 1:
+            for loaded in pending:
+                owners[loaded] = name
+            pending = []
+    return times, owners
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="App cold-start import profile.")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Fresh interpreters to run; the fastest is reported")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules to list")
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="Fail if the app's own imports (besides streamlit) take longer")
+    args = parser.parse_args(argv)
+
+    modules = app_imports()
+    framework = [m for m in modules if m.split(".")[0] == FRAMEWORK]
+    if framework and importlib.util.find_spec(FRAMEWORK) is None:
+        print(f"{FRAMEWORK} is not installed; measuring the app's own imports only\n")
+        modules = [m for m in modules if m not in framework]
+        framework = []
+
+    def cost(run, names):
+        # A module already loaded by an earlier import costs nothing here
+        times, owners = run
+        return sum(times[m][1] for m in names if owners.get(m) == m) / 1000
+
+    runs = [profile(modules) for _ in range(args.repeat)]
+    best, owners = min(runs, key=lambda run: cost(run, modules))
+    total_ms = cost((best, owners), modules)
+    framework_ms = cost((best, owners), framework)
+    own_ms = total_ms - framework_ms
+
+    print(f"app imports, best of {args.repeat}: {total_ms:.1f} ms")
+    for module in modules:
+        if owners.get(module) == module:
+            print(f"  {module:<24}{best[module][1] / 1000:>9.1f} ms")
+    if framework:
+        print(f"\n{FRAMEWORK}: {framework_ms:.1f} ms, of which")
+        for name in LAZY + ("pyarrow",):
+            if name in best and owners.get(name, "").split(".")[0] == FRAMEWORK:
+                print(f"  {name:<24}{best[name][1] / 1000:>9.1f} ms")
+        print(f"app's own imports: {own_ms:.1f} ms")
+    print(f"\nslowest modules (self time):")
+    for name, (own, _) in sorted(best.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"  {name:<40}{own / 1000:>9.1f} ms")
+
+    # Only what the app pulls in itself; streamlit may load pandas regardless
+    loaded = sorted(
+        f"{name} (via {owners[name]})" for name in best
+        if name in LAZY and owners.get(name, name).split(".")[0] != FRAMEWORK
+    )
+    failed = False
+    if loaded:
+        print(f"\nFAIL: imported at startup but should load lazily: {', '.join(loaded)}")
+        failed = True
+    if args.max_ms is not None and own_ms > args.max_ms:
+        print(f"\nFAIL: {own_ms:.1f} ms exceeds the {args.max_ms:.1f} ms budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
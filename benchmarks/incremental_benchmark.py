@@ -0,0 +1,105 @@
+# benchmarks/incremental_benchmark.py
+#
+# Latency of re-advising after a single edit to a student's record with a
+# long-lived IncrementalAdvisor, compared with full recomputation: a new
+# IncrementalAdvisor, the one-shot CourseAdvisor engine, and the direct
+# pipeline. Edits are passing a recommended course, failing or dropping a
+# passed one, moving the CGPA and switching the semester. Every incremental
+# result must equal the direct pipeline's.
+#
+#   python benchmarks/incremental_benchmark.py --students 20 --edits 10
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from advising import recommend
+from advising_benchmark import percentile
+from inference_engine import IncrementalAdvisor, advise_with_engine
+from synthetic import SEMESTERS, generate_students
+
+EDITS = ("pass", "fail", "drop", "cgpa", "semester")
+PATHS = ("incremental", "rebuild", "engine", "direct")
+
+
+def apply_edit(advisor, kind, rng, recommendations):
+    """Make one random edit of the given kind; False if there is nothing to edit"""
+    if kind == "pass":
+        if not recommendations:
+            return False
+        advisor.pass_course(rng.choice(recommendations)["Course Code"])
+    elif kind == "fail":
+        if not advisor.passed:
+            return False
+        advisor.fail_course(rng.choice(sorted(advisor.passed)))
+    elif kind == "drop":
+        if not advisor.passed | advisor.failed:
+            return False
+        advisor.drop_course(rng.choice(sorted(advisor.passed | advisor.failed)))
+    elif kind == "cgpa":
+        advisor.set_cgpa(round(rng.uniform(1.0, 4.0), 2))
+    else:
+        advisor.set_semester([s for s in SEMESTERS if s != advisor.semester][0])
+    return True
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incremental re-advising benchmark.")
+    parser.add_argument("--students", type=int, default=20)
+    parser.add_argument("--edits", type=int, default=10, help="Edits per student")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    samples = {(kind, path): [] for kind in EDITS for path in PATHS}
+    first_run = []
+    mismatches = 0
+
+    for student in generate_students(args.students, args.seed):
+        advisor = IncrementalAdvisor(student["cgpa"], student["passed"], student["failed"], student["semester"])
+        (recommendations, _), seconds = timed(advisor.advise)
+        first_run.append(seconds)
+
+        for _ in range(args.edits):
+            kind = rng.choice(EDITS)
+            if not apply_edit(advisor, kind, rng, recommendations):
+                continue
+            inputs = (advisor.cgpa, sorted(advisor.passed), sorted(advisor.failed), advisor.semester)
+
+            result, seconds = timed(advisor.advise)
+            samples[kind, "incremental"].append(seconds)
+            _, seconds = timed(lambda: IncrementalAdvisor(*inputs).advise())
+            samples[kind, "rebuild"].append(seconds)
+            _, seconds = timed(advise_with_engine, *inputs)
+            samples[kind, "engine"].append(seconds)
+            expected, seconds = timed(lambda: recommend(*inputs, use_cache=False))
+            samples[kind, "direct"].append(seconds)
+
+            mismatches += result != expected
+            recommendations = result[0]
+
+    first_run.sort()
+    print(f"{args.students} students, {args.edits} edits each, {mismatches} mismatches")
+    print(f"first advise(): p50 {percentile(first_run, 0.5) * 1000:.1f} ms")
+    print(f"\n{'edit':<10}{'n':>5}" + "".join(f"{path + ' p50/p95 ms':>26}" for path in PATHS))
+    for kind in EDITS:
+        row = f"{kind:<10}{len(samples[kind, PATHS[0]]):>5}"
+        for path in PATHS:
+            values = sorted(samples[kind, path])
+            row += f"{percentile(values, 0.5) * 1000:>19.2f} /{percentile(values, 0.95) * 1000:>5.1f}" if values else f"{'-':>26}"
+        print(row)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# benchmarks/memory_benchmark.py
+#
+# Per-process memory held by the catalog's courses, as CourseRecords versus
+# the frozen dicts they replace, for the real catalog and scaled-up
+# synthetic copies. Each scale is measured in a fresh interpreter, as in a
+# new pool worker; the courses are parsed from JSON inside the measurement
+# so shared (interned) strings are counted fairly.
+#
+#   python benchmarks/memory_benchmark.py --scale 1 100
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from catalog import CourseRecord, _freeze
+from synthetic import _thaw, scale_catalog
+
+
+def _retained(build, payload):
+    """Bytes still allocated after parsing payload and building from it"""
+    gc.collect()
+    tracemalloc.start()
+    result = build(json.loads(payload))
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def measure(factor):
+    """Runs in the child process; prints one JSON line"""
+    courses = [_thaw(course) for course in scale_catalog(factor).courses.values()]
+    payload = json.dumps(courses)
+
+    dicts = _retained(lambda raw: {c["code"]: _freeze(c) for c in raw}, payload)
+    records = _retained(lambda raw: {c["code"]: CourseRecord(c) for c in raw}, payload)
+
+    out = {"courses": len(courses), "dict_bytes": dicts, "record_bytes": records}
+    try:
+        import resource
+        out["rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except ImportError:
+        pass
+    print(json.dumps(out))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Course representation memory benchmark.")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 100],
+                        help="Catalog size multipliers to test")
+    parser.add_argument("--measure", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.measure is not None:
+        measure(args.measure)
+        return 0
+
+    print(f"{'scale':<7}{'courses':>9}{'dicts KB':>11}{'records KB':>12}{'saved':>8}{'B/course':>10}{'rss MB':>9}")
+    for factor in args.scale:
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--measure", str(factor)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        r = json.loads(output)
+        saved = 1 - r["record_bytes"] / r["dict_bytes"]
+        print(f"{str(factor) + 'x':<7}{r['courses']:>9}"
+              f"{r['dict_bytes'] / 1024:>11.0f}{r['record_bytes'] / 1024:>12.0f}"
+              f"{saved:>8.0%}{r['record_bytes'] / r['courses']:>10.0f}"
+              f"{r.get('rss_mb', 0.0):>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
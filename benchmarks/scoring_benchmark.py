@@ -0,0 +1,84 @@
+# benchmarks/scoring_benchmark.py
+#
+# Compare the scalar priority function with the NumPy cohort scorer:
+# scoring every course for every student, and producing each student's
+# eligible courses in priority order. Both paths must give identical
+# scores and identical rankings.
+#
+#   python benchmarks/scoring_benchmark.py --students 500 --scale 1 10 100
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from advising import AdvisingPipeline
+from cohort_scoring import features_for, rank_cohort, score_matrix
+from synthetic import generate_students, scale_catalog
+
+
+def bench_scale(factor, count):
+    catalog = scale_catalog(factor)
+    students = list(generate_students(count, seed=factor, catalog=catalog))
+    all_courses = [catalog.courses[code] for code in catalog.course_codes]
+    features_for(catalog)
+
+    pipeline = AdvisingPipeline()
+    pipeline.catalog = catalog
+    pipeline._pin_catalog()
+
+    # Score every course for every student
+    start = time.perf_counter()
+    scalar_scores = []
+    for s in students:
+        context = pipeline._build_student_context(s["cgpa"], s["passed"], s["failed"], s["semester"])
+        scalar_scores.append(pipeline._get_course_priorities(all_courses, context))
+    scalar_score_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matrix = score_matrix(students, catalog)
+    vector_score_seconds = time.perf_counter() - start
+
+    # Eligible courses in priority order
+    start = time.perf_counter()
+    scalar_ranked = []
+    for s in students:
+        context = pipeline._build_student_context(s["cgpa"], s["passed"], s["failed"], s["semester"])
+        available = pipeline._get_available_courses(catalog.courses, s["semester"])
+        eligible = pipeline._filter_eligible_courses(available, context)
+        scalar_ranked.append(pipeline._sort_courses_by_priority(eligible, context))
+    scalar_rank_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vector_ranked = rank_cohort(students, catalog)
+    vector_rank_seconds = time.perf_counter() - start
+
+    score_mismatches = sum(1 for row, scores in zip(matrix.tolist(), scalar_scores) if row != scores)
+    rank_mismatches = sum(
+        1 for a, b in zip(scalar_ranked, vector_ranked)
+        if [c.code for c in a] != [c.code for c in b]
+    )
+    print(f"\nScale {factor}x: {len(catalog.courses)} courses, {count} students, "
+          f"{score_mismatches} score / {rank_mismatches} ranking mismatches")
+    print(f"  {'':<8}{'scalar ms':>11}{'numpy ms':>10}{'speedup':>9}")
+    for name, scalar, vector in (("score", scalar_score_seconds, vector_score_seconds),
+                                 ("rank", scalar_rank_seconds, vector_rank_seconds)):
+        print(f"  {name:<8}{scalar * 1000:>11.1f}{vector * 1000:>10.1f}{scalar / vector:>8.1f}x")
+    return score_mismatches + rank_mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scalar vs NumPy priority scoring benchmark.")
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10, 100],
+                        help="Catalog size multipliers to test")
+    args = parser.parse_args(argv)
+
+    mismatches = sum(bench_scale(factor, args.students) for factor in args.scale)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
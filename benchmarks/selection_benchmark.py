@@ -0,0 +1,66 @@
+# benchmarks/selection_benchmark.py
+#
+# Compare greedy first-fit selection with the exact knapsack selection:
+# total priority captured, credits used and per-call latency.
+#
+#   python benchmarks/selection_benchmark.py --students 2000
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from advising import AdvisingPipeline
+from synthetic import generate_students
+
+
+def _run(pipeline, student, selection):
+    start = time.perf_counter()
+    selected = pipeline.run_pipeline(
+        student["cgpa"], student["passed"], student["failed"], student["semester"], selection
+    )
+    elapsed = time.perf_counter() - start
+    priority = sum(pipeline._get_course_priorities(selected, pipeline._context))
+    credits = sum(course["credits"] for course in selected)
+    return elapsed, priority, credits, pipeline._context.credit_limit
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare greedy and optimal (knapsack) course selection."
+    )
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    pipeline = AdvisingPipeline()
+    results = {"greedy": [], "optimal": []}
+    for student in generate_students(args.students, args.seed):
+        for selection in results:
+            results[selection].append(_run(pipeline, student, selection))
+
+    greedy, optimal = results["greedy"], results["optimal"]
+    improved = sum(1 for g, o in zip(greedy, optimal) if o[1] > g[1])
+    print(f"Students: {args.students}")
+    print(f"{'mode':<8} {'mean ms':>8} {'p95 ms':>8} {'priority':>12} {'credit use':>11}")
+    for selection, rows in results.items():
+        times = sorted(row[0] * 1000 for row in rows)
+        p95 = times[int(len(times) * 0.95) - 1] if len(times) > 1 else times[0]
+        priority = sum(row[1] for row in rows)
+        usage = sum(row[2] for row in rows) / max(1, sum(row[3] for row in rows))
+        print(f"{selection:<8} {statistics.mean(times):>8.3f} {p95:>8.3f} "
+              f"{priority:>12} {usage:>10.1%}")
+    gain = sum(o[1] - g[1] for g, o in zip(greedy, optimal))
+    print(f"Optimal selection captured more priority for {improved} students "
+          f"(+{gain} points in total).")
+    if any(o[1] < g[1] for g, o in zip(greedy, optimal)):
+        print("❌ Optimal selection scored below greedy for some students.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+# benchmarks/service_load_test.py
+#
+# Load-test the HTTP advising service (src/advising_server.py) from
+# keep-alive client connections. Measures requests/sec and p50/p95/p99
+# latency. Every /advise response is checked against the same advice
+# computed locally. Each run uses new students, so the service's result
+# and report caches stay cold. Starts its own server on a free port
+# unless --url points at a running one, and then checks that SIGTERM
+# shuts it down cleanly without leaving worker processes behind.
+#
+#   python benchmarks/service_load_test.py --requests 5000 --concurrency 1 16 64
+#   python benchmarks/service_load_test.py --endpoint batch --batch-size 100 --requests 50
+#   python benchmarks/service_load_test.py --endpoint report --requests 100 --concurrency 8
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from advising_benchmark import percentile
+from batch_advising import advise_record
+from synthetic import generate_students
+
+SERVER = os.path.join(os.path.dirname(__file__), '..', 'src', 'advising_server.py')
+
+# Seconds the server gets to exit after SIGTERM
+SHUTDOWN_TIMEOUT = 30
+
+
+async def call(reader, writer, host, path, body):
+    """One request on an open connection; returns (status, body bytes)"""
+    writer.write((f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+    status = int(head.split(" ", 2)[1])
+    length = int(re.search(r"(?im)^content-length:\s*(\d+)", head).group(1))
+    return status, await reader.readexactly(length)
+
+
+async def load(host, port, path, bodies, concurrency):
+    """Send all bodies over `concurrency` connections; returns responses, latencies and wall time"""
+    pending = iter(enumerate(bodies))
+    responses = [None] * len(bodies)
+    latencies = []
+
+    async def client():
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for index, body in pending:
+                start = time.perf_counter()
+                responses[index] = await call(reader, writer, host, path, body)
+                latencies.append(time.perf_counter() - start)
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return responses, sorted(latencies), time.perf_counter() - start
+
+
+def build_requests(endpoint, count, batch_size, seed):
+    """Request bodies and, for /advise, the expected response of each"""
+    if endpoint == "batch":
+        students = list(generate_students(count * batch_size, seed))
+        bodies = [json.dumps({"students": students[i:i + batch_size]}).encode("utf-8")
+                  for i in range(0, len(students), batch_size)]
+        return "/advise/batch", bodies, None
+
+    students = list(generate_students(count, seed))
+    bodies = [json.dumps(s).encode("utf-8") for s in students]
+    if endpoint == "report":
+        return "/report", bodies, None
+    return "/advise", bodies, [advise_record(s) for s in students]
+
+
+def start_server(workers):
+    command = [sys.executable, SERVER, "--port", "0"]
+    if workers:
+        command += ["--workers", str(workers)]
+    process = subprocess.Popen(command, stderr=subprocess.PIPE, text=True)
+    for line in process.stderr:
+        match = re.search(r"http://([^:]+):(\d+)", line)
+        if match:
+            return process, match.group(1), int(match.group(2))
+    raise RuntimeError("Advising service did not start")
+
+
+def child_pids(pid):
+    """Direct children of a process (Linux only; empty elsewhere)"""
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+
+def alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def stop_server(process):
+    """SIGTERM the server; number of problems with its shutdown"""
+    children = child_pids(process.pid)
+    process.terminate()
+    try:
+        code = process.wait(SHUTDOWN_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        print(f"\nFAIL: server still running {SHUTDOWN_TIMEOUT} s after SIGTERM")
+        process.kill()
+        process.wait()
+        return 1
+
+    deadline = time.monotonic() + 5
+    left = [pid for pid in children if alive(pid)]
+    while left and time.monotonic() < deadline:
+        time.sleep(0.1)
+        left = [pid for pid in left if alive(pid)]
+    problems = 0
+    if code != 0:
+        print(f"\nFAIL: server exited with code {code} on SIGTERM")
+        problems += 1
+    if left:
+        print(f"\nFAIL: worker processes left running: {', '.join(map(str, left))}")
+        problems += 1
+    if not problems:
+        print(f"\nserver shut down cleanly ({len(children)} child processes stopped)")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Advising service load test.")
+    parser.add_argument("--url", help="Running service to test (default: start one)")
+    parser.add_argument("--endpoint", choices=("advise", "batch", "report"), default="advise")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--batch-size", type=int, default=100, help="Students per batch request")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Worker processes for the started server")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    process = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        process, host, port = start_server(args.workers)
+
+    failures = 0
+    try:
+        # Warm up the workers (and the report pool) before measuring
+        path, bodies, _ = build_requests(args.endpoint, 8, args.batch_size, -1)
+        asyncio.run(load(host, port, path, bodies, 8))
+        print(f"{args.requests} requests to {path}")
+        print(f"{'clients':<9}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+        for run, concurrency in enumerate(args.concurrency):
+            # New students each run, so the server's caches do not answer for it
+            path, bodies, expected = build_requests(args.endpoint, args.requests, args.batch_size,
+                                                    args.seed + run)
+            responses, latencies, wall = asyncio.run(load(host, port, path, bodies, concurrency))
+            errors = sum(1 for status, _ in responses if status != 200)
+            if expected is not None:
+                errors += sum(1 for (status, payload), want in zip(responses, expected)
+                              if status == 200 and json.loads(payload) != want)
+            failures += errors
+            print(f"{concurrency:<9}{len(bodies) / wall:>9,.0f}"
+                  + "".join(f"{percentile(latencies, q) * 1000:>9.2f}" for q in (0.50, 0.95, 0.99))
+                  + f"{errors:>8}")
+    finally:
+        if process is not None:
+            failures += stop_server(process)
+            process.stderr.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
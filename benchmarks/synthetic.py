@@ -0,0 +1,123 @@
+# benchmarks/synthetic.py
+
+import os
+import random
+import sys
+from collections.abc import Mapping
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from catalog import LEVELS, PLAN_SEMESTERS, Catalog, get_catalog
+
+SEMESTERS = ("Fall", "Spring")
+
+
+def _thaw(value):
+    """Turn a frozen catalog structure (or CourseRecord) back into plain dicts and lists"""
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+def scale_catalog(factor, catalog=None):
+    """Build a catalog with `factor` copies of every course.
+
+    Copy n of course X is "X~n" and depends on copy n of X's prerequisites,
+    so each copy keeps the real prerequisite structure; copies are also
+    added to the same study-plan slots as the original. factor=1 returns
+    the real catalog.
+    """
+    catalog = catalog or get_catalog()
+    if factor <= 1:
+        return catalog
+
+    def rename(code, copy):
+        return code if copy == 0 or code not in catalog.courses else f"{code}~{copy}"
+
+    courses = {}
+    for copy in range(factor):
+        for code, course in catalog.courses.items():
+            clone = _thaw(course)
+            clone["code"] = rename(code, copy)
+            clone["prerequisites"] = [rename(p, copy) for p in course.get("prerequisites", ())]
+            courses[clone["code"]] = clone
+
+    study_plan = _thaw(catalog.study_plan)
+    for level in LEVELS:
+        for semester in PLAN_SEMESTERS:
+            entries = study_plan[level][semester]["courses"]
+            clones = []
+            for copy in range(1, factor):
+                for entry in entries:
+                    if entry["code"] in catalog.courses:
+                        clones.append(dict(entry, code=rename(entry["code"], copy)))
+            entries.extend(clones)
+
+    return Catalog(courses, _thaw(catalog.policies), study_plan,
+                   version=f"{catalog.version}x{factor}")
+
+
+def _topological_order(courses):
+    """Course codes ordered so every prerequisite comes before its dependents"""
+    order = []
+    state = {}
+
+    def visit(code):
+        if state.get(code):
+            return
+        state[code] = True
+        for prereq in courses[code].get("prerequisites", ()):
+            if prereq in courses:
+                visit(prereq)
+        order.append(code)
+
+    for code in courses:
+        visit(code)
+    return order
+
+
+def _random_cgpa(rng, policies):
+    """Pick a credit-limit band uniformly, then a CGPA inside it"""
+    band = rng.choice(policies["credit_limits"])
+    low, high = band["cgpa_min"], band["cgpa_max"]
+    cgpa = round(rng.uniform(max(low, 0.5), high), 2)
+    if band["exclusive_max"] and cgpa >= high:
+        cgpa = round(high - 0.01, 2)
+    return cgpa
+
+
+def generate_students(count, seed=0, catalog=None):
+    """Yield synthetic student profiles consistent with the prerequisite graph.
+
+    Each student has a progress target (share of the catalog completed); a
+    course can only be passed once all its prerequisites were passed, and
+    failed courses are drawn from those the student was eligible for but
+    did not pass. Returns dicts with cgpa, passed, failed and semester.
+    """
+    catalog = catalog or get_catalog()
+    courses = catalog.courses
+    order = _topological_order(courses)
+    rng = random.Random(seed)
+
+    for index in range(count):
+        progress = rng.random()
+        passed = set()
+        eligible_not_passed = []
+        for code in order:
+            prereqs = courses[code].get("prerequisites", ())
+            if all(p in passed for p in prereqs):
+                if rng.random() < progress:
+                    passed.add(code)
+                else:
+                    eligible_not_passed.append(code)
+
+        failed_count = min(len(eligible_not_passed), rng.choice((0, 0, 0, 1, 1, 2, 3)))
+        yield {
+            "student_id": f"S{index:06d}",
+            "cgpa": _random_cgpa(rng, catalog.policies),
+            "passed": sorted(passed),
+            "failed": sorted(rng.sample(eligible_not_passed, failed_count)),
+            "semester": rng.choice(SEMESTERS)
+        }
@@ -0,0 +1,104 @@
+# benchmarks/what_if_benchmark.py
+#
+# Cost of a what-if sweep (what_if.sweep) compared with advising every
+# variant independently, the way recommend(use_cache=False) does. Each
+# base student gets the same mix of variants: failed courses passed,
+# passed courses failed, CGPA moved into every Policies.json band and the
+# other semester. Both paths must return identical advice for every
+# variant.
+#
+#   python benchmarks/what_if_benchmark.py --students 20 --variants 50 --scale 1 10
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from advising import AdvisingPipeline, recommendation_row
+from cohort_scoring import features_for
+from synthetic import SEMESTERS, generate_students, scale_catalog
+from what_if import apply_variant, sweep
+
+
+def advise_once(catalog, cgpa, passed, failed, semester):
+    """One uncached advising run, as recommend(use_cache=False) does it"""
+    pipeline = AdvisingPipeline()
+    pipeline.catalog = catalog
+    selected = pipeline.run_pipeline(cgpa, passed, failed, semester)
+    recommendations = [recommendation_row(course, catalog) for course in selected]
+    return recommendations, pipeline._generate_explanations(selected, pipeline._context)
+
+
+def make_variants(student, catalog, count, rng):
+    """Up to count single and combined changes to one student"""
+    other = [s for s in SEMESTERS if s != student["semester"]][0]
+    bands = [(band["cgpa_min"] + band["cgpa_max"]) / 2 for band in catalog.policies["credit_limits"]]
+    changes = [{"semester": other}]
+    changes += [{"cgpa": cgpa} for cgpa in bands]
+    changes += [{"pass": [code]} for code in student["failed"]]
+    changes += [{"fail": [code]} for code in rng.sample(student["passed"], min(10, len(student["passed"])))]
+
+    variants = list(changes)
+    while len(variants) < count:
+        first, second = rng.sample(changes, 2)
+        variants.append(dict(first, **second))
+    return variants[:count]
+
+
+def bench_scale(factor, count, variant_count):
+    catalog = scale_catalog(factor)
+    features_for(catalog)
+    rng = random.Random(factor)
+    students = list(generate_students(count, seed=factor, catalog=catalog))
+    cases = [(s, make_variants(s, catalog, variant_count, rng)) for s in students]
+
+    start = time.perf_counter()
+    for s, _ in cases:
+        advise_once(catalog, s["cgpa"], s["passed"], s["failed"], s["semester"])
+    single_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    swept = [sweep(s["cgpa"], s["passed"], s["failed"], s["semester"], variants, catalog=catalog)
+             for s, variants in cases]
+    sweep_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    independent = [
+        [advise_once(catalog, *apply_variant(s["cgpa"], s["passed"], s["failed"], s["semester"], v))
+         for v in variants]
+        for s, variants in cases
+    ]
+    independent_seconds = time.perf_counter() - start
+
+    mismatches = sum(
+        1
+        for result, expected in zip(swept, independent)
+        for variant, (recommendations, explanations) in zip(result["variants"], expected)
+        if variant["recommendations"] != recommendations or variant["explanations"] != explanations
+    )
+    print(f"\nScale {factor}x: {len(catalog.courses)} courses, {count} students x "
+          f"{variant_count} variants, {mismatches} mismatches")
+    for name, seconds in (("single", single_seconds), ("sweep", sweep_seconds),
+                          ("separate", independent_seconds)):
+        print(f"  {name:<10}{seconds / count * 1000:>9.2f} ms/student"
+              f"{seconds / single_seconds:>8.1f}x single")
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="What-if sweep benchmark.")
+    parser.add_argument("--students", type=int, default=20)
+    parser.add_argument("--variants", type=int, default=50)
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10],
+                        help="Catalog size multipliers to test")
+    args = parser.parse_args(argv)
+
+    mismatches = sum(bench_scale(factor, args.students, args.variants) for factor in args.scale)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,555 @@
+# src/advising.py
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from catalog import get_catalog, iter_bits, mask_from_ids
+from instrumentation import NULL_TRACE, finish_trace, start_trace
+
+# Default number of distinct advising inputs kept by the result cache
+DEFAULT_CACHE_SIZE = 1024
+
+# How the final course list is chosen from the priority-sorted candidates:
+# "greedy" takes courses in priority order while they fit, "optimal" solves
+# the credit budget exactly as a 0/1 knapsack over priority scores.
+SELECTION_MODES = ("greedy", "optimal")
+
+# Priority points for each course type (see _get_course_priorities)
+TYPE_PRIORITY = {
+    "core": 200,
+    "university_compulsory": 150,
+    "field_training": 100,
+    "graduation": 90,
+    "elective": 80,
+    "university_elective": 70,
+    "zero_credit": 60
+}
+
+
+class StudentContext:
+    """Per-request student invariants, computed once and shared by every stage"""
+
+    def __init__(self, cgpa, passed, failed, semester, credit_limit,
+                 earned_credits, current_level, next_level, previous_level,
+                 passed_mask=0):
+        self.cgpa = cgpa
+        self.passed = passed
+        # Catalog.course_mask() of the passed courses
+        self.passed_mask = passed_mask
+        self.failed = failed
+        self.semester = semester
+        self.credit_limit = credit_limit
+        self.earned_credits = earned_credits
+        self.current_level = current_level
+        self.next_level = next_level
+        self.previous_level = previous_level
+
+
+class AdvisingPipeline:
+    """Course recommendation logic shared by the rule engine and the fast path.
+
+    Holds no experta state, so it can run on its own (see recommend()) or be
+    mixed into CourseAdvisor, whose rule simply delegates to run_pipeline().
+    """
+
+    # Selection mode used when run_pipeline() is not given one
+    selection = "greedy"
+
+    # Catalog to advise against; None means the shared, auto-reloading one
+    catalog = None
+
+    # Per-request instrumentation (see instrumentation.start_trace)
+    _trace = NULL_TRACE
+
+    def run_pipeline(self, cgpa, passed, failed, semester, selection=None):
+        """Select the recommended courses for one student"""
+        selection = selection or self.selection
+        if selection not in SELECTION_MODES:
+            raise ValueError(f"Unknown selection mode: {selection}")
+        trace = self._trace
+
+        with trace.stage("load"):
+            # Load all course data (one shared, read-only snapshot)
+            catalog = self._pin_catalog()
+            courses = catalog.courses
+
+            # Everything that depends only on the student is computed once here
+            context = self._build_student_context(cgpa, passed, failed, semester)
+        
+        with trace.stage("filter"):
+            # Get available courses for the semester
+            available_courses = self._get_available_courses(courses, semester)
+
+            # Filter courses based on prerequisites and failed courses
+            eligible_courses = self._filter_eligible_courses(available_courses, context)
+        
+        with trace.stage("sort"):
+            # Sort courses by priority with enhanced logic
+            sorted_courses = self._sort_courses_by_priority(eligible_courses, context)
+        
+        with trace.stage("select"):
+            # Select courses within credit limit
+            if selection == "optimal":
+                selected = self._select_courses_optimal(sorted_courses, context)
+            else:
+                selected = self._select_courses_within_limit(
+                    sorted_courses,
+                    context.credit_limit
+                )
+
+        trace.note(
+            catalog_version=catalog.version,
+            selection=selection,
+            available=len(available_courses),
+            eligible=len(eligible_courses),
+            selected=len(selected)
+        )
+        return selected
+
+    def _pin_catalog(self):
+        """Take the current catalog snapshot for this advising run"""
+        self._catalog = self.catalog if self.catalog is not None else get_catalog()
+        return self._catalog
+
+    def _get_catalog(self):
+        """Catalog snapshot of the current run (pinned on first use)"""
+        catalog = getattr(self, "_catalog", None)
+        return catalog if catalog is not None else self._pin_catalog()
+
+    def _build_student_context(self, cgpa, passed, failed, semester):
+        """Collect the per-student values every stage of the pipeline needs"""
+        catalog = self._get_catalog()
+        passed = frozenset(passed)
+        earned_credits = catalog.plan_credits_earned(passed)
+        current_level = self._get_level_for_credits(earned_credits)
+
+        self._context = StudentContext(
+            cgpa=cgpa,
+            passed=passed,
+            failed=frozenset(failed),
+            semester=semester,
+            credit_limit=self._get_credit_limit(cgpa, catalog.policies),
+            earned_credits=earned_credits,
+            current_level=current_level,
+            next_level=self._get_next_level(current_level),
+            previous_level=self._get_previous_level(current_level),
+            passed_mask=catalog.course_mask(passed)
+        )
+        return self._context
+
+    def _get_credit_band(self, cgpa, policies):
+        """Index of the credit-limit band the CGPA falls in (None if none)"""
+        for index, limit in enumerate(policies["credit_limits"]):
+            if (limit["cgpa_min"] <= cgpa < limit["cgpa_max"] if limit["exclusive_max"]
+                else limit["cgpa_min"] <= cgpa <= limit["cgpa_max"]):
+                return index
+        return None
+
+    def _get_credit_limit(self, cgpa, policies):
+        """Get maximum allowed credits based on CGPA"""
+        band = self._get_credit_band(cgpa, policies)
+        if band is not None:
+            return policies["credit_limits"][band]["max_credits"]
+        return 12  # Default limit
+
+    def _get_available_courses(self, courses, semester):
+        """Get courses available in the given semester"""
+        catalog = self._get_catalog()
+        if courses is catalog.courses:
+            return list(catalog.courses_by_semester.get(semester, ()))
+
+        # Course sets that did not come from the catalog have no index
+        return [
+            course for course in courses.values()
+            if course.offered_in(semester)
+        ]
+
+    def _filter_eligible_courses(self, courses, context):
+        """Filter courses based on prerequisites and failed courses"""
+        catalog = self._get_catalog()
+        ids = catalog.course_ids
+        prerequisite_masks = catalog.prerequisite_masks
+        external = catalog.external_prerequisites
+        passed = context.passed
+        passed_mask = context.passed_mask
+        eligible = []
+        for course in courses:
+            # Skip if course is already passed
+            if course.code in passed:
+                continue
+
+            # Check prerequisites: one mask test for those that are courses
+            cid = ids[course.code]
+            prereq_mask = prerequisite_masks[cid]
+            if prereq_mask & passed_mask != prereq_mask:
+                continue
+            if cid in external and not all(p in passed for p in external[cid]):
+                continue
+
+            eligible.append(course)
+        
+        return eligible
+
+    def _get_level_for_credits(self, total_credits):
+        """Map earned study-plan credits to a level"""
+        if total_credits < 30:
+            return "level_1"
+        elif total_credits < 60:
+            return "level_2"
+        elif total_credits < 90:
+            return "level_3"
+        else:
+            return "level_4"
+
+    def _sort_courses_by_priority(self, courses, context):
+        """Enhanced course prioritization based on multiple factors"""
+        priorities = self._get_course_priorities(courses, context)
+        order = sorted(range(len(courses)), key=priorities.__getitem__, reverse=True)
+        return [courses[i] for i in order]
+
+    def _get_course_priorities(self, courses, context):
+        """Priority score of each course, in the order given"""
+        catalog = self._get_catalog()
+        count = self._trace.count
+        failed = context.failed
+        semester = context.semester
+        current_level = context.current_level
+        next_level = context.next_level
+        previous_level = context.previous_level
+
+        def get_course_priority(course):
+            priority = 0
+            count("course_level")
+            course_level = catalog.course_level(course.code)
+            
+            # 1. Failed courses get highest priority (1000 points)
+            if course.code in failed:
+                priority += 1000
+            
+            # 2. Level-based priority (500 points)
+            if course_level == current_level:
+                priority += 500
+            elif course_level == next_level:
+                priority += 300
+            elif course_level == previous_level:
+                priority += 100
+            
+            # 3. Course type priority
+            priority += TYPE_PRIORITY.get(course.type, 0)
+            
+            # 4. Semester alignment (100 points)
+            if course.offered_in(semester):
+                priority += 100
+            
+            # 5. Prerequisite chain priority (50 points per level)
+            count("prerequisite_chain")
+            prereq_chain = catalog.prerequisite_chain(course.code)
+            priority += len(prereq_chain) * 50
+            
+            # 6. Credit hours priority (10 points per credit)
+            priority += course.credits * 10
+            
+            return priority
+        
+        return [get_course_priority(course) for course in courses]
+
+    def _get_next_level(self, current_level):
+        """Get the next level in sequence"""
+        levels = ["level_1", "level_2", "level_3", "level_4"]
+        current_index = levels.index(current_level)
+        return levels[current_index + 1] if current_index < len(levels) - 1 else current_level
+
+    def _get_previous_level(self, current_level):
+        """Get the previous level in sequence"""
+        levels = ["level_1", "level_2", "level_3", "level_4"]
+        current_index = levels.index(current_level)
+        return levels[current_index - 1] if current_index > 0 else current_level
+
+    def _select_courses_within_limit(self, courses, credit_limit):
+        """Select courses within the credit limit"""
+        selected = []
+        total_credits = 0
+        
+        for course in courses:
+            if total_credits + course.credits <= credit_limit:
+                selected.append(course)
+                total_credits += course.credits
+        
+        return selected
+
+    def _select_courses_optimal(self, courses, context):
+        """Select the courses with the highest total priority within the credit limit.
+
+        Solves the 0/1 knapsack exactly; credit budgets are small, so the
+        table has at most a few hundred cells per course. Ties go to the
+        higher-ranked course and the result keeps the priority order.
+        """
+        credit_limit = context.credit_limit
+        priorities = self._get_course_priorities(courses, context)
+        count = len(courses)
+
+        # best[i][c]: highest total priority from courses[i:] within c credits
+        best = [[0] * (credit_limit + 1) for _ in range(count + 1)]
+        for i in range(count - 1, -1, -1):
+            credits = courses[i].credits
+            row, below = best[i], best[i + 1]
+            for c in range(credit_limit + 1):
+                row[c] = below[c]
+                if credits <= c and below[c - credits] + priorities[i] > row[c]:
+                    row[c] = below[c - credits] + priorities[i]
+
+        # Walk forward, taking a course whenever it is part of an optimum
+        selected = []
+        remaining = credit_limit
+        for i, course in enumerate(courses):
+            credits = course.credits
+            if (credits <= remaining
+                    and best[i + 1][remaining - credits] + priorities[i] == best[i][remaining]):
+                selected.append(course)
+                remaining -= credits
+        return selected
+
+    def _generate_explanations(self, courses, context):
+        """Generate detailed explanations for course recommendations"""
+        catalog = self._get_catalog()
+        failed = context.failed
+        semester = context.semester
+        current_level = context.current_level
+        explanations = []
+        
+        for course in courses:
+            explanation = f"Recommended {course.code} ({course.name}) because:"
+            
+            # Failed course explanation
+            if course.code in failed:
+                explanation += " You need to retake this failed course."
+            
+            # Prerequisites explanation (only for courses that list them)
+            if "prerequisites" in course:
+                prereqs = ", ".join(course.prerequisites)
+                explanation += f" You have completed the prerequisites ({prereqs})."
+            
+            # Course type explanation
+            course_type = course.type
+            if course_type == "core":
+                explanation += " This is a core course required for your degree."
+            elif course_type == "university_compulsory":
+                explanation += " This is a compulsory university requirement."
+            elif course_type == "field_training":
+                explanation += " This is a field training course required for practical experience."
+            elif course_type == "graduation":
+                explanation += " This is a graduation project/thesis course."
+            elif course_type == "elective":
+                explanation += " This is a technical elective course for your specialization."
+            elif course_type == "university_elective":
+                explanation += " This is a university elective course to broaden your knowledge."
+            elif course_type == "zero_credit":
+                explanation += " This is a zero-credit course required for graduation."
+            
+            # Level explanation
+            self._trace.count("course_level")
+            course_level = catalog.course_level(course.code)
+            if course_level == current_level:
+                explanation += f" This course is part of your current level ({current_level})."
+            elif course_level == context.next_level:
+                explanation += f" This course is from the next level, but you have completed enough credits to take it."
+            elif course_level == context.previous_level:
+                explanation += f" This course is from a previous level that you haven't completed yet."
+            
+            # Semester explanation
+            if course.offered_in(semester):
+                explanation += f" This course is offered in the {semester} semester."
+            
+            # Credit hours explanation
+            if course_type != "zero_credit":
+                explanation += f" This course is worth {course.credits} credit hours."
+            else:
+                explanation += " This is a zero-credit course."
+            
+            explanations.append(explanation)
+        
+        return explanations
+
+
+def eligible_course_masks(students, semester, catalog=None):
+    """Eligible-course bitmask of many students at once.
+
+    students is a sequence of passed-course collections. Instead of testing
+    each student's courses one by one, this works course by course over
+    cohort bitsets (bit s set for student s), so every prerequisite is
+    checked for the whole cohort with a single AND. The result has one
+    Catalog.course_mask()-style mask per student, covering the courses
+    _filter_eligible_courses would keep for that student in semester.
+    """
+    catalog = catalog or get_catalog()
+    ids = catalog.course_ids
+    passed_sets = [frozenset(passed) for passed in students]
+    everyone = (1 << len(passed_sets)) - 1
+
+    # took[cid]: students who passed the course
+    took = [0] * len(catalog.course_codes)
+    for s, passed in enumerate(passed_sets):
+        bit = 1 << s
+        for code in passed:
+            cid = ids.get(code)
+            if cid is not None:
+                took[cid] |= bit
+
+    eligible = [[] for _ in passed_sets]
+    for cid in iter_bits(catalog.semester_masks.get(semester, 0)):
+        allowed = everyone & ~took[cid]
+        for prereq in catalog.prerequisite_ids[cid]:
+            allowed &= took[prereq]
+            if not allowed:
+                break
+        for prereq in catalog.external_prerequisites.get(cid, ()):
+            for s in iter_bits(allowed):
+                if prereq not in passed_sets[s]:
+                    allowed &= ~(1 << s)
+        for s in iter_bits(allowed):
+            eligible[s].append(cid)
+    return [mask_from_ids(cids) for cids in eligible]
+
+
+def recommendation_row(course, catalog):
+    """Shape a selected course like the rows advise_student returns"""
+    return {
+        "Course Code": course.code,
+        "Course Name": course.name,
+        "Credits": course.credits,
+        "Type": course.type.value,
+        "Semester": course.semester_offered[0],
+        "Level": course.get("level", catalog.course_level(course.code))
+    }
+
+
+class RecommendationCache:
+    """Thread-safe LRU cache of advising results.
+
+    Entries belong to one catalog version; the whole cache is dropped as
+    soon as a lookup arrives for a different version.
+    """
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version, key):
+        """Return the cached result for key, or None on a miss"""
+        with self._lock:
+            if version != self.version:
+                self._entries.clear()
+                self.version = version
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, version, key, result):
+        with self._lock:
+            if self.maxsize <= 0 or version != self.version:
+                return
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "catalog_version": self.version
+            }
+
+
+_cache = RecommendationCache()
+
+
+def configure_cache(maxsize):
+    """Resize the result cache; a size of 0 disables caching"""
+    global _cache
+    _cache = RecommendationCache(maxsize)
+
+
+def cache_info():
+    return _cache.info()
+
+
+def clear_cache():
+    _cache.clear()
+
+
+def advice_cache_key(passed_courses, failed_courses, semester, credit_band, selection="greedy"):
+    """Canonical hash of everything a recommendation depends on.
+
+    Course lists are order- and duplicate-insensitive, and the CGPA only
+    matters through the Policies.json credit-limit band it falls in.
+    """
+    canonical = json.dumps([
+        semester,
+        sorted(set(passed_courses)),
+        sorted(set(failed_courses)),
+        credit_band,
+        selection
+    ], separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def recommend(cgpa, passed_courses, failed_courses, semester,
+              selection="greedy", use_cache=True):
+    """Get course recommendations without going through the rule engine.
+
+    Takes the same arguments and returns the same (recommendations,
+    explanations) pair as inference_engine.advise_student. Identical
+    inputs are answered from the result cache unless use_cache is False.
+    """
+    pipeline = AdvisingPipeline()
+    pipeline._trace = trace = start_trace("direct")
+    try:
+        catalog = pipeline._pin_catalog()
+
+        if use_cache:
+            with trace.stage("cache"):
+                band = pipeline._get_credit_band(cgpa, catalog.policies)
+                key = advice_cache_key(passed_courses, failed_courses, semester, band, selection)
+                cached = _cache.get(catalog.version, key)
+            trace.note(cache_hit=cached is not None)
+            if cached is not None:
+                recommendations, explanations = cached
+                return [dict(row) for row in recommendations], list(explanations)
+
+        selected_courses = pipeline.run_pipeline(
+            cgpa, passed_courses, failed_courses, semester, selection
+        )
+        catalog = pipeline._get_catalog()
+        with trace.stage("explain"):
+            recommendations = [recommendation_row(course, catalog) for course in selected_courses]
+            explanations = pipeline._generate_explanations(selected_courses, pipeline._context)
+
+        if use_cache:
+            _cache.put(catalog.version, key, (
+                tuple(dict(row) for row in recommendations),
+                tuple(explanations)
+            ))
+        return recommendations, explanations
+    finally:
+        finish_trace(trace)
@@ -0,0 +1,293 @@
+# src/advising_server.py
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from http import HTTPStatus
+
+from advising import SELECTION_MODES
+from batch_advising import _warm_catalog, advise_record
+from catalog import get_catalog
+from pdf_generator import get_report_queue, safe_report_name
+
+# Largest request body accepted, in bytes
+MAX_BODY = 16 * 1024 * 1024
+
+# Records sent to a worker at a time by /advise/batch
+BATCH_CHUNK_SIZE = 64
+
+
+def _encode(payload):
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def _advise_body(body):
+    """Worker: decode one /advise body, advise it and encode the response.
+
+    The event loop only frames HTTP; parsing, advising and serializing all
+    happen in the pool. Returns (status, JSON bytes).
+    """
+    try:
+        record = json.loads(body)
+    except ValueError as e:
+        return 400, _encode({"error": f"Invalid JSON: {e}"})
+    if not isinstance(record, dict):
+        return 400, _encode({"error": "Expected a JSON object"})
+    selection = record.get("selection", "greedy")
+    if selection not in SELECTION_MODES:
+        return 400, _encode({"error": f"Unknown selection mode: {selection}"})
+
+    result = advise_record(record, selection)
+    return (400 if "error" in result else 200), _encode(result)
+
+
+def _advise_chunk(records, selection):
+    """Worker: advise a slice of a batch request"""
+    return [advise_record(record, selection) for record in records]
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class AdvisingServer:
+    """Minimal asyncio HTTP/1.1 JSON service over the advising pipeline.
+
+    Endpoints:
+      GET  /health        catalog version and worker count
+      POST /advise        one student (cgpa, passed, failed, semester)
+      POST /advise/batch  {"students": [...]}; results in input order
+      POST /report        one student's PDF report (application/pdf)
+
+    Advising runs on a process pool, so the event loop only reads and
+    writes HTTP. Reports go through the shared ReportQueue, which has its
+    own pool and cache. Connections are kept alive unless the client
+    asks otherwise.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8080, workers=None):
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = None
+        self._server = None
+
+    async def start(self):
+        get_catalog()
+        # spawn: forking a process with a running event loop is not safe
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_catalog
+        )
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        get_report_queue().shutdown()
+
+    async def _run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as e:
+                    await self._respond(writer, e.status, _encode({"error": str(e)}), keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                try:
+                    status, content_type, payload, extra = await self._dispatch(method, path, body)
+                except HTTPError as e:
+                    status, content_type, payload, extra = e.status, "application/json", _encode({"error": str(e)}), {}
+                except Exception as e:
+                    status, content_type = 500, "application/json"
+                    payload, extra = _encode({"error": f"{type(e).__name__}: {e}"}), {}
+                await self._respond(writer, status, payload, content_type, extra, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        """(method, path, headers, body) of the next request, or None at EOF"""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(431, "Request headers too large")
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, path, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length < 0:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > MAX_BODY:
+            raise HTTPError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), path.split("?", 1)[0], headers, body
+
+    async def _respond(self, writer, status, payload, content_type="application/json",
+                       extra=None, keep_alive=True):
+        head = [
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(payload)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"
+        ]
+        head += [f"{name}: {value}" for name, value in (extra or {}).items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload)
+        await writer.drain()
+
+    async def _dispatch(self, method, path, body):
+        routes = {
+            "/health": ("GET", self._health),
+            "/advise": ("POST", self._advise),
+            "/advise/batch": ("POST", self._advise_batch),
+            "/report": ("POST", self._report)
+        }
+        if path not in routes:
+            raise HTTPError(404, f"No such endpoint: {path}")
+        allowed, handler = routes[path]
+        if method != allowed:
+            raise HTTPError(405, f"Use {allowed} for {path}")
+        return await handler(body)
+
+    async def _health(self, body):
+        payload = {"status": "ok", "catalog_version": get_catalog().version, "workers": self.workers}
+        return 200, "application/json", _encode(payload), {}
+
+    async def _advise(self, body):
+        status, payload = await self._run(_advise_body, body)
+        return status, "application/json", payload, {}
+
+    async def _advise_batch(self, body):
+        request = self._decode(body)
+        students = request.get("students")
+        if not isinstance(students, list):
+            raise HTTPError(400, "Expected {\"students\": [...]}")
+        selection = request.get("selection", "greedy")
+        if selection not in SELECTION_MODES:
+            raise HTTPError(400, f"Unknown selection mode: {selection}")
+
+        chunks = [students[i:i + BATCH_CHUNK_SIZE] for i in range(0, len(students), BATCH_CHUNK_SIZE)]
+        done = await asyncio.gather(*(self._run(_advise_chunk, chunk, selection) for chunk in chunks))
+        results = [result for chunk in done for result in chunk]
+        return 200, "application/json", _encode({"results": results}), {}
+
+    async def _report(self, body):
+        """PDF for a student; advises first unless recommendations are given"""
+        request = self._decode(body)
+        student_id = str(request.get("student_id", "")).strip()
+
+        if "recommendations" in request:
+            recommendations = request["recommendations"]
+            explanations = request.get("explanations", [])
+        else:
+            selection = request.get("selection", "greedy")
+            if selection not in SELECTION_MODES:
+                raise HTTPError(400, f"Unknown selection mode: {selection}")
+            result = (await self._run(_advise_chunk, [request], selection))[0]
+            if "error" in result:
+                raise HTTPError(400, result["error"])
+            recommendations, explanations = result["recommendations"], result["explanations"]
+
+        student_info = {
+            "student_id": student_id,
+            "name": request.get("name", ""),
+            "email": request.get("email", ""),
+            "level": request.get("level", ""),
+            "registration_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        job = get_report_queue().submit(student_info, recommendations, explanations)
+        data = await asyncio.wrap_future(job.future)
+        filename = f"course_recommendation_{safe_report_name(student_id)}.pdf"
+        return 200, "application/pdf", data, {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+    def _decode(self, body):
+        try:
+            request = json.loads(body)
+        except ValueError as e:
+            raise HTTPError(400, f"Invalid JSON: {e}")
+        if not isinstance(request, dict):
+            raise HTTPError(400, "Expected a JSON object")
+        return request
+
+
+async def _serve(args):
+    server = await AdvisingServer(args.host, args.port, args.workers).start()
+    print(f"✅ Advising service on http://{server.host}:{server.port} "
+          f"({server.workers} workers)", file=sys.stderr, flush=True)
+
+    # Stop serving on SIGTERM/SIGINT so close() shuts down both worker pools
+    serving = asyncio.ensure_future(server.serve_forever())
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(signum, serving.cancel)
+        except NotImplementedError:
+            # Windows: Ctrl+C still arrives as KeyboardInterrupt
+            pass
+    try:
+        await serving
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP/JSON course advising service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080, help="0 picks a free port")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Advising worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
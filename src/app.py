@@ -1,40 +1,85 @@
 # src/app.py
 
+import threading
+from datetime import datetime
+
 import streamlit as st
-import pandas as pd
-import os
-from inference_engine import advise_student
-from knowledge_base import get_all_courses
+# The app's modules do not import pandas, reportlab or experta: tables are
+# plain rows, reports render in worker processes and the app advises
+# through the direct pipeline (streamlit still imports pandas itself)
+from advising import cache_info, recommend
+from catalog import get_catalog
+from instrumentation import instrumentation_enabled, stats as pipeline_stats
 from student_auth import StudentAuth
-from pdf_generator import PDFGenerator
-
-# Initialize components
-student_auth = StudentAuth()
-pdf_generator = PDFGenerator()
+from pdf_generator import get_report_queue
 
-# Load all course data once
-all_courses = get_all_courses()
-course_codes = list(all_courses.keys())
-course_names = {code: all_courses[code]["name"] for code in course_codes}
+# Must be the first Streamlit command: on Streamlit 1.14 every cached call
+# (hit or miss) draws a spinner element, which set_page_config forbids
+st.set_page_config(page_title="AIU Course Advisor", layout="wide")
 
 # Course type colors for better visualization
 course_type_colors = {
     "core": "🔵",
     "university_compulsory": "🟢",
     "field_training": "🟡",
-    "graduation_project": "🟣",
+    "graduation": "🟣",
     "elective": "🟠",
     "university_elective": "⚪",
     "zero_credit": "⚫"
 }
 
+# Streamlit 1.18 renamed the caching decorators; fall back to the 1.14 names
+cache_resource = getattr(st, "cache_resource", None) or st.experimental_singleton
+cache_data = getattr(st, "cache_data", None) or st.experimental_memo
+
+
+@cache_resource
+def load_components():
+    """Student store and report queue, shared by every session and rerun.
+
+    Also starts loading the catalog once per process in the background, so
+    it is ready by the time the student has filled in the first form.
+    """
+    threading.Thread(target=get_catalog, name="catalog-warmup", daemon=True).start()
+    return StudentAuth(), get_report_queue()
+
+
+@cache_data(max_entries=4)
+def build_course_options(catalog_version):
+    """Course codes grouped by type, their multiselect labels and the group legend"""
+    all_courses = get_catalog().courses
+
+    # Group courses by type for better organization
+    course_groups = {t: list(codes) for t, codes in get_catalog().courses_by_type.items()}
+    # Graduation project phases are listed in order
+    if "graduation" in course_groups:
+        course_groups["graduation"].sort(key=lambda x: all_courses[x].get("phase", 0))
+
+    course_labels = {}
+    for code, course in all_courses.items():
+        course_labels[code] = f"{code} - {course.get('name', '')}"
+        if course["type"] == "graduation":
+            course_labels[code] += f" (Phase {course.get('phase', 'N/A')})"
+
+    course_legend = {
+        course_type: f"{course_type_colors.get(course_type, '⚪')} {course_type.replace('_', ' ').title()}"
+        for course_type in course_groups
+    }
+    return course_groups, course_labels, course_legend
+
+
+# Initialize components
+student_auth, report_queue = load_components()
+
 # App layout
-st.set_page_config(page_title="AIU Course Advisor", layout="wide")
 st.title("🎓 AIU Course Registration Advising System")
 
 # Session state initialization
 if 'student_info' not in st.session_state:
     st.session_state.student_info = None
+if 'advice' not in st.session_state:
+    st.session_state.advice = None
+    st.session_state.report_job = None
 
 # Student Information Form
 if st.session_state.student_info is None:
@@ -57,13 +102,18 @@ if st.session_state.student_info is None:
                     'name': name,
                     'email': email,
                     'level': level,
-                    'registration_date': pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
+                    'registration_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 }
                 st.success("Information saved successfully!")
                 st.experimental_rerun()
 
 # Main Application
 if st.session_state.student_info:
+    # Shared catalog; the widget options are only rebuilt when its files change
+    catalog = get_catalog()
+    all_courses = catalog.courses
+    course_groups, course_labels, course_legend = build_course_options(catalog.version)
+
     # Display student info in sidebar
     with st.sidebar:
         st.header("Student Information")
@@ -79,6 +129,8 @@ if st.session_state.student_info:
         
         if st.button("Clear Information"):
             st.session_state.student_info = None
+            st.session_state.advice = None
+            st.session_state.report_job = None
             st.experimental_rerun()
 
     # Course Recommendation Form
@@ -91,60 +143,40 @@ if st.session_state.student_info:
         with col2:
             cgpa = st.number_input("📊 Enter Your Current CGPA", min_value=0.0, max_value=4.0, step=0.01)
 
-        # Group courses by type for better organization
-        course_groups = {}
-        for code in course_codes:
-            course_type = all_courses[code].get("type", "core")
-            if course_type not in course_groups:
-                course_groups[course_type] = []
-            course_groups[course_type].append(code)
-
         # Passed courses selection
         st.subheader("✅ Courses You've Already Passed")
         passed_courses = []
         for course_type, codes in course_groups.items():
-            with st.expander(f"{course_type_colors.get(course_type, '⚪')} {course_type.replace('_', ' ').title()}"):
+            with st.expander(course_legend[course_type]):
                 # Special handling for graduation projects
-                if course_type == "graduation_project":
-                    # Sort by phase
-                    codes.sort(key=lambda x: all_courses[x].get("phase", 0))
-                    selected = st.multiselect(
-                        f"Select passed graduation project phases",
-                        options=codes,
-                        format_func=lambda x: f"{x} - {course_names.get(x, '')} (Phase {all_courses[x].get('phase', 'N/A')})",
-                        key=f"passed_{course_type}"
-                    )
+                if course_type == "graduation":
+                    prompt = "Select passed graduation project phases"
                 else:
-                    selected = st.multiselect(
-                        f"Select passed {course_type} courses",
-                        options=codes,
-                        format_func=lambda x: f"{x} - {course_names.get(x, '')}",
-                        key=f"passed_{course_type}"
-                    )
+                    prompt = f"Select passed {course_type} courses"
+                selected = st.multiselect(
+                    prompt,
+                    options=codes,
+                    format_func=course_labels.__getitem__,
+                    key=f"passed_{course_type}"
+                )
                 passed_courses.extend(selected)
 
         # Failed courses selection
         st.subheader("❌ Courses You've Failed")
         failed_courses = []
         for course_type, codes in course_groups.items():
-            with st.expander(f"{course_type_colors.get(course_type, '⚪')} {course_type.replace('_', ' ').title()}"):
+            with st.expander(course_legend[course_type]):
                 # Special handling for graduation projects
-                if course_type == "graduation_project":
-                    # Sort by phase
-                    codes.sort(key=lambda x: all_courses[x].get("phase", 0))
-                    selected = st.multiselect(
-                        f"Select failed graduation project phases",
-                        options=codes,
-                        format_func=lambda x: f"{x} - {course_names.get(x, '')} (Phase {all_courses[x].get('phase', 'N/A')})",
-                        key=f"failed_{course_type}"
-                    )
+                if course_type == "graduation":
+                    prompt = "Select failed graduation project phases"
                 else:
-                    selected = st.multiselect(
-                        f"Select failed {course_type} courses",
-                        options=codes,
-                        format_func=lambda x: f"{x} - {course_names.get(x, '')}",
-                        key=f"failed_{course_type}"
-                    )
+                    prompt = f"Select failed {course_type} courses"
+                selected = st.multiselect(
+                    prompt,
+                    options=codes,
+                    format_func=course_labels.__getitem__,
+                    key=f"failed_{course_type}"
+                )
                 failed_courses.extend(selected)
 
         submit = st.form_submit_button("Get Course Recommendations")
@@ -153,47 +185,70 @@ if st.session_state.student_info:
     if submit:
         if cgpa <= 0.0:
             st.error("Please enter a valid CGPA greater than 0.")
+            st.session_state.advice = None
+            st.session_state.report_job = None
         else:
             with st.spinner("Analyzing..."):
-                recommendations, explanations = advise_student(cgpa, passed_courses, failed_courses, semester)
-
-            st.success("✅ Recommendation Complete!")
+                recommendations, explanations = recommend(cgpa, passed_courses, failed_courses, semester)
 
+            # Keep results across reruns so the report can be polled
+            st.session_state.advice = (recommendations, explanations)
+            st.session_state.report_job = None
             if recommendations:
-                st.subheader("📚 Recommended Courses")
-                df = pd.DataFrame(recommendations)
-                
-                # Add emoji indicators for course types and phase information for graduation projects
-                df['Type'] = df.apply(lambda row: 
-                    f"{course_type_colors.get(row['Type'], '⚪')} {row['Type'].replace('_', ' ').title()}" + 
-                    (f" (Phase {all_courses[row['Course Code']].get('phase', 'N/A')})" 
-                     if row['Type'] == 'graduation_project' else ""),
-                    axis=1
-                )
-                
-                st.dataframe(df, use_container_width=True)
-                st.markdown(f"**Total Credit Hours Recommended:** {df['Credits'].sum()}")
-                
-                # Generate PDF Report
-                pdf_path = pdf_generator.generate_report(
+                # Render the PDF in the background instead of blocking here
+                st.session_state.report_job = report_queue.submit(
                     st.session_state.student_info,
                     recommendations,
                     explanations
                 )
-                
-                with open(pdf_path, "rb") as f:
-                    st.download_button(
-                        "📥 Download Report (PDF)",
-                        f,
-                        file_name=f"course_recommendation_{st.session_state.student_info['student_id']}.pdf",
-                        mime="application/pdf"
-                    )
-            else:
-                st.warning("⚠️ No eligible courses found for the selected semester and input.")
 
-            st.subheader("🧠 Explanation for Each Recommendation")
-            for exp in explanations:
-                st.markdown(f"- {exp}")
+    if st.session_state.advice is not None:
+        recommendations, explanations = st.session_state.advice
+        st.success("✅ Recommendation Complete!")
+
+        if recommendations:
+            st.subheader("📚 Recommended Courses")
+            rows = []
+            for row in recommendations:
+                # Add emoji indicators for course types and phase information for graduation projects
+                label = f"{course_type_colors.get(row['Type'], '⚪')} {row['Type'].replace('_', ' ').title()}"
+                if row['Type'] == 'graduation':
+                    label += f" (Phase {all_courses[row['Course Code']].get('phase', 'N/A')})"
+                rows.append(dict(row, Type=label))
+            
+            st.dataframe(rows, use_container_width=True)
+            st.markdown(f"**Total Credit Hours Recommended:** {sum(row['Credits'] for row in rows)}")
+            
+            # PDF Report
+            report_job = st.session_state.report_job
+            if report_job.status == "done":
+                st.download_button(
+                    "📥 Download Report (PDF)",
+                    report_job.result(),
+                    file_name=f"course_recommendation_{st.session_state.student_info['student_id']}.pdf",
+                    mime="application/pdf"
+                )
+            elif report_job.status == "failed":
+                st.error("⚠️ The PDF report could not be generated.")
+            else:
+                st.info("⏳ Your PDF report is being generated...")
+                st.button("🔄 Check Report Status")
+        else:
+            st.warning("⚠️ No eligible courses found for the selected semester and input.")
+
+        st.subheader("🧠 Explanation for Each Recommendation")
+        for exp in explanations:
+            st.markdown(f"- {exp}")
+
+# Admin: advising pipeline timings (only when ADVISOR_INSTRUMENT=1)
+if instrumentation_enabled():
+    with st.sidebar.expander("⚙️ Pipeline Stats"):
+        st.json(pipeline_stats.snapshot())
+        st.caption("Result cache")
+        st.json(cache_info())
+        if pipeline_stats.last_profile:
+            st.caption("Last cProfile capture")
+            st.text(pipeline_stats.last_profile)
 
 # Footer
 st.markdown("---")
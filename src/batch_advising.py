@@ -0,0 +1,203 @@
+# src/batch_advising.py
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+from functools import partial
+from itertools import islice
+from multiprocessing import Pool
+
+from advising import SELECTION_MODES, recommend
+from catalog import get_catalog
+from graduation_planner import plan_graduation
+
+# Course lists in CSV cells are separated by semicolons and/or whitespace
+CODE_SEPARATOR = re.compile(r"[;\s]+")
+
+
+def _parse_codes(value):
+    """Accept a JSON list or a separated string of course codes"""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(code).strip() for code in value if str(code).strip()]
+    return [code for code in CODE_SEPARATOR.split(str(value)) if code]
+
+
+def normalize_record(record):
+    """Turn a raw CSV/JSONL row into advise_student arguments"""
+    semester = str(record["semester"] or "").strip().title()
+    if not semester:
+        raise ValueError("semester is empty")
+    return {
+        "student_id": str(record.get("student_id", "")).strip(),
+        "cgpa": float(record["cgpa"]),
+        "passed": _parse_codes(record.get("passed")),
+        "failed": _parse_codes(record.get("failed")),
+        "semester": semester
+    }
+
+
+def read_student_records(path):
+    """Lazily yield raw student records from a .csv or .jsonl file.
+
+    A JSONL line that is not valid JSON yields {"error": ...} in its place,
+    so one bad line is reported in the results instead of ending the run.
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                yield row
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    yield {"error": f"Line {number}: {type(e).__name__}: {e}"}
+
+
+def _unusable(record):
+    """Error result for a record that cannot be read as a student, or None"""
+    if not isinstance(record, dict):
+        return {"student_id": "", "error": f"Expected a JSON object, got {type(record).__name__}"}
+    if "error" in record:
+        # A line read_student_records could not parse
+        return {"student_id": "", "error": record["error"]}
+    return None
+
+
+def advise_record(record, selection="greedy"):
+    """Advise one raw record; errors are reported in the result, not raised"""
+    unusable = _unusable(record)
+    if unusable is not None:
+        return unusable
+    student_id = str(record.get("student_id", "")).strip()
+    try:
+        student = normalize_record(record)
+        if student["semester"] not in get_catalog().semester_masks:
+            raise ValueError(f"No courses are offered in semester {student['semester']!r}")
+        recommendations, explanations = recommend(
+            student["cgpa"],
+            student["passed"],
+            student["failed"],
+            student["semester"],
+            selection
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        return {"student_id": student_id, "error": f"{type(e).__name__}: {e}"}
+
+    return {
+        "student_id": student["student_id"],
+        "semester": student["semester"],
+        "recommendations": recommendations,
+        "explanations": explanations,
+        "total_credits": sum(r["Credits"] for r in recommendations)
+    }
+
+
+def plan_record(record):
+    """Plan one raw record through to graduation; errors are reported in the result"""
+    unusable = _unusable(record)
+    if unusable is not None:
+        return unusable
+    student_id = str(record.get("student_id", "")).strip()
+    try:
+        student = normalize_record(record)
+        plan = plan_graduation(
+            student["cgpa"],
+            student["passed"],
+            student["failed"],
+            student["semester"]
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        return {"student_id": student_id, "error": f"{type(e).__name__}: {e}"}
+
+    return dict({"student_id": student["student_id"]}, **plan)
+
+
+def _warm_catalog():
+    """Pool initializer: make sure each worker has the catalog loaded"""
+    get_catalog()
+
+
+def advise_batch(records, workers=None, chunksize=64, selection="greedy", plan=False):
+    """Advise an iterable of student records, yielding results in input order.
+
+    Records are consumed in bounded windows so memory stays flat however
+    large the cohort is. With workers=1 everything runs in this process;
+    otherwise the work fans out over a process pool that shares the
+    catalog loaded here before the workers start. With plan=True each
+    record gets a full graduation plan instead of next-semester advice.
+    """
+    get_catalog()
+    records = iter(records)
+    advise = plan_record if plan else partial(advise_record, selection=selection)
+
+    if workers == 1:
+        for record in records:
+            yield advise(record)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    window = workers * chunksize * 4
+    with Pool(workers, initializer=_warm_catalog) as pool:
+        while True:
+            batch = list(islice(records, window))
+            if not batch:
+                break
+            for result in pool.imap(advise, batch, chunksize):
+                yield result
+
+
+def write_results(results, output):
+    """Stream results to a JSONL file object; returns (written, failed)"""
+    written = failed = 0
+    for result in results:
+        output.write(json.dumps(result, ensure_ascii=False) + "\n")
+        written += 1
+        if "error" in result:
+            failed += 1
+    return written, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Pre-compute course recommendations for a whole cohort."
+    )
+    parser.add_argument("input", help="Student records (.csv or .jsonl) with "
+                        "student_id, cgpa, passed, failed and semester")
+    parser.add_argument("-o", "--output", default="-",
+                        help="JSONL file to write results to (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count, 1 = no pool)")
+    parser.add_argument("--chunksize", type=int, default=64,
+                        help="Records sent to a worker at a time")
+    parser.add_argument("--selection", choices=SELECTION_MODES, default="greedy",
+                        help="How courses are chosen within the credit limit")
+    parser.add_argument("--plan", action="store_true",
+                        help="Plan each student's remaining semesters to graduation")
+    args = parser.parse_args(argv)
+
+    results = advise_batch(
+        read_student_records(args.input), args.workers, args.chunksize,
+        args.selection, args.plan
+    )
+    if args.output == "-":
+        written, failed = write_results(results, sys.stdout)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            written, failed = write_results(results, f)
+
+    print(f"✅ Advised {written - failed} students ({failed} failed).", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
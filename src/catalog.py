@@ -0,0 +1,502 @@
+# src/catalog.py
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import sys
+import threading
+from collections.abc import Mapping
+from enum import Enum
+from types import MappingProxyType
+
+# Resolved from this file so the data is found whatever the working directory
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data'))
+COURSES_DIR = os.path.join(DATA_DIR, 'Courses')
+ELECTIVES_DIR = os.path.join(COURSES_DIR, 'Electives')
+UNIREQ_DIR = os.path.join(COURSES_DIR, 'UniReq')
+
+# Course files in load order with the type tag the engine assigns to them.
+# Later files win when the same code appears twice.
+COURSE_SOURCES = [
+    (os.path.join(COURSES_DIR, "Core_courses.json"), "core"),
+    (os.path.join(COURSES_DIR, "Graduation_courses.json"), "graduation"),
+    (os.path.join(COURSES_DIR, "FT_courses.json"), "field_training"),
+    (os.path.join(ELECTIVES_DIR, "Elective_courses.json"), "elective"),
+    (os.path.join(UNIREQ_DIR, "Compulsory_unireq.json"), "university_compulsory"),
+    (os.path.join(UNIREQ_DIR, "Elective_unireq.json"), "university_elective"),
+    (os.path.join(UNIREQ_DIR, "Zero_unireq.json"), "zero_credit"),
+]
+POLICIES_PATH = os.path.join(DATA_DIR, "Policies.json")
+STUDY_PLAN_PATH = os.path.join(DATA_DIR, "StudyPlan.json")
+
+# Compiled snapshot of all of the above, written by `python src/catalog.py build`
+SNAPSHOT_PATH = os.path.join(DATA_DIR, "catalog.snapshot")
+# Bump when the snapshot layout or the index format changes
+SNAPSHOT_FORMAT = 1
+
+LEVELS = ("level_1", "level_2", "level_3", "level_4")
+PLAN_SEMESTERS = ("fall", "spring")
+
+# Bit of each semester in CourseRecord.semester_mask; any other semester
+# name found in the data is given the next free bit
+SEMESTER_BITS = {"Fall": 1, "Spring": 2, "Summer": 4}
+
+
+def _freeze(value):
+    """Recursively turn dicts into read-only mappings and lists into tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _semester_bit(name):
+    bit = SEMESTER_BITS.get(name)
+    if bit is None:
+        bit = SEMESTER_BITS.setdefault(name, 1 << len(SEMESTER_BITS))
+    return bit
+
+
+class CourseType(str, Enum):
+    """Course type tag; compares, hashes and formats exactly like its value"""
+
+    CORE = "core"
+    GRADUATION = "graduation"
+    FIELD_TRAINING = "field_training"
+    ELECTIVE = "elective"
+    UNIVERSITY_COMPULSORY = "university_compulsory"
+    UNIVERSITY_ELECTIVE = "university_elective"
+    ZERO_CREDIT = "zero_credit"
+
+    __str__ = str.__str__
+    __format__ = str.__format__
+    __hash__ = str.__hash__
+
+
+# Fields every CourseRecord stores in its own slot; anything else in the
+# JSON (phase, track, category, ...) goes into CourseRecord.extra
+RECORD_FIELDS = ("code", "name", "credits", "type", "semester_offered",
+                 "prerequisites", "corequisites", "description")
+
+# One shared tuple per distinct set of keys present in the source JSON
+_KEY_LAYOUTS = {}
+
+
+class CourseRecord(Mapping):
+    """Compact, immutable course.
+
+    Fields live in slots: codes (the course's own and the ones it refers
+    to) are interned, prerequisites and semesters are tuples,
+    semester_mask has one SEMESTER_BITS bit per semester offered and type
+    is a CourseType. The engine reads the attributes; the record is also
+    a read-only mapping with the keys of the JSON it came from, so
+    course["name"] and "prerequisites" in course still work.
+    """
+
+    __slots__ = RECORD_FIELDS + ("semester_mask", "extra", "_keys")
+
+    def __init__(self, course):
+        init = object.__setattr__
+        init(self, "code", sys.intern(course["code"]))
+        init(self, "name", course.get("name", ""))
+        init(self, "credits", course.get("credits", 0))
+        init(self, "type", CourseType(course.get("type", "core")))
+        init(self, "description", course.get("description", ""))
+
+        semesters = tuple(sys.intern(s) for s in course.get("semester_offered", ()))
+        mask = 0
+        for semester in semesters:
+            mask |= _semester_bit(semester)
+        init(self, "semester_offered", semesters)
+        init(self, "semester_mask", mask)
+        init(self, "prerequisites", tuple(sys.intern(p) for p in course.get("prerequisites") or ()))
+        init(self, "corequisites", tuple(sys.intern(c) for c in course.get("corequisites") or ()))
+
+        extra = {k: _freeze(v) for k, v in course.items() if k not in RECORD_FIELDS}
+        init(self, "extra", MappingProxyType(extra) if extra else None)
+        keys = tuple(k for k in RECORD_FIELDS if k in course or k == "type")
+        init(self, "_keys", _KEY_LAYOUTS.setdefault(keys, keys))
+
+    def offered_in(self, semester):
+        """Whether the course runs in the given semester ("Fall", ...)"""
+        return bool(self.semester_mask & SEMESTER_BITS.get(semester, 0))
+
+    def __getitem__(self, key):
+        if key in self._keys:
+            return getattr(self, key)
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield from self._keys
+        if self.extra is not None:
+            yield from self.extra
+
+    def __len__(self):
+        return len(self._keys) + (len(self.extra) if self.extra is not None else 0)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CourseRecord is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("CourseRecord is immutable")
+
+    def __hash__(self):
+        return hash(self.code)
+
+    def __reduce__(self):
+        return (CourseRecord, (dict(self),))
+
+    def __repr__(self):
+        return f"CourseRecord({self.code!r}, {self.name!r})"
+
+
+def _index_study_plan(study_plan):
+    """Map each code to its level and to its (level, semester, slot) position.
+
+    The first occurrence wins, matching a level-by-level scan of the plan.
+    Also returns every plan entry as a (code, credits) pair in plan order.
+    """
+    levels = {}
+    positions = {}
+    entries = []
+    for level in LEVELS:
+        for semester in PLAN_SEMESTERS:
+            for slot, course in enumerate(study_plan[level][semester]["courses"]):
+                levels.setdefault(course["code"], level)
+                positions.setdefault(course["code"], (level, semester, slot))
+                entries.append((course["code"], course["credits"]))
+    return levels, positions, tuple(entries)
+
+
+def _index_prerequisites(courses):
+    """Build the transitive prerequisite closure and depth of every course.
+
+    closure[code] lists every direct and indirect prerequisite in depth-first
+    order; depth[code] is the length of the longest prerequisite path. The
+    graph is expected to be a DAG; a cycle is cut where it closes instead of
+    being followed.
+    """
+    closure = {}
+    depth = {}
+
+    def visit(code, stack):
+        if code in closure:
+            return closure[code]
+        chain = []
+        seen = set()
+        longest = 0
+        stack.add(code)
+        course = courses.get(code)
+        for prereq in (course.get("prerequisites", ()) if course else ()):
+            if prereq not in seen:
+                seen.add(prereq)
+                chain.append(prereq)
+            if prereq in stack:
+                continue
+            for code_below in visit(prereq, stack):
+                if code_below not in seen:
+                    seen.add(code_below)
+                    chain.append(code_below)
+            longest = max(longest, depth[prereq] + 1)
+        stack.discard(code)
+        closure[code] = tuple(chain)
+        depth[code] = longest
+        return closure[code]
+
+    for code in courses:
+        visit(code, set())
+    return closure, depth
+
+
+def build_indexes(courses, study_plan):
+    """Every lookup index of a Catalog, as plain picklable values"""
+    levels, positions, entries = _index_study_plan(study_plan)
+    closure, depth = _index_prerequisites(courses)
+    by_type = {}
+    for code, course in courses.items():
+        by_type.setdefault(str(course["type"]), []).append(code)
+    return {
+        "course_levels": levels,
+        "plan_positions": positions,
+        "plan_credits": entries,
+        "prerequisite_closure": closure,
+        "prerequisite_depth": depth,
+        "courses_by_type": {t: tuple(codes) for t, codes in by_type.items()}
+    }
+
+
+def _index_bitsets(courses):
+    """Dense ids and bitmasks for set-based eligibility tests.
+
+    Course ids follow catalog order, so walking the set bits of a mask
+    yields courses in the same order as iterating the catalog. A
+    prerequisite that is not a catalog course (e.g. "Completion of 90
+    credits") cannot be a bit and is kept in external_prerequisites.
+    """
+    codes = tuple(courses)
+    ids = {code: cid for cid, code in enumerate(codes)}
+    prerequisite_ids = []
+    prerequisite_masks = []
+    external = {}
+    semester_masks = {}
+    for cid, course in enumerate(courses.values()):
+        mask = 0
+        for prereq in course.prerequisites:
+            if prereq in ids:
+                mask |= 1 << ids[prereq]
+            else:
+                external.setdefault(cid, []).append(prereq)
+        prerequisite_ids.append(tuple(iter_bits(mask)))
+        prerequisite_masks.append(mask)
+        for semester in course.semester_offered:
+            semester_masks[semester] = semester_masks.get(semester, 0) | 1 << cid
+    return {
+        "course_codes": codes,
+        "course_ids": ids,
+        "prerequisite_ids": tuple(prerequisite_ids),
+        "prerequisite_masks": tuple(prerequisite_masks),
+        "external_prerequisites": {cid: tuple(p) for cid, p in external.items()},
+        "semester_masks": semester_masks
+    }
+
+
+def iter_bits(mask):
+    """Indexes of the set bits of mask, lowest first"""
+    # One pass over the binary digits; clearing bits one at a time would
+    # copy a large mask once per bit
+    digits = bin(mask)[:1:-1]
+    index = digits.find("1")
+    while index != -1:
+        yield index
+        index = digits.find("1", index + 1)
+
+
+def mask_from_ids(ids):
+    """Bitmask with the given bit indexes set"""
+    ids = list(ids)
+    if not ids:
+        return 0
+    digits = bytearray(b"0" * (max(ids) + 1))
+    for index in ids:
+        digits[index] = 49  # "1"
+    return int(digits[::-1].decode("ascii"), 2)
+
+
+def _source_paths():
+    return [path for path, _ in COURSE_SOURCES] + [POLICIES_PATH, STUDY_PLAN_PATH]
+
+
+def _source_stamp():
+    """Cheap change detector: (path, mtime, size) of every source file"""
+    stamp = []
+    for path in _source_paths():
+        st = os.stat(path)
+        stamp.append((path, st.st_mtime_ns, st.st_size))
+    return tuple(stamp)
+
+
+class Catalog:
+    """Read-only snapshot of the course catalog, policies and study plan.
+
+    A single instance is shared by every engine and session in the process;
+    use get_catalog() to obtain the current one instead of constructing it.
+    Courses are CourseRecords tagged with the type of the file they came
+    from. Lookup indexes over the study plan, the course types and the
+    prerequisite graph are built here, once per load, so nothing has to
+    rescan them. Each course also has a dense integer id, its bit in
+    course_mask(), prerequisite_masks and semester_masks.
+    """
+
+    def __init__(self, courses, policies, study_plan, version, stamp=None, indexes=None):
+        self.courses = MappingProxyType({
+            sys.intern(code): course if isinstance(course, CourseRecord) else CourseRecord(course)
+            for code, course in courses.items()
+        })
+        self.policies = _freeze(policies)
+        self.study_plan = _freeze(study_plan)
+        self.version = version
+        self.stamp = stamp
+
+        # Precomputed indexes come from a compiled snapshot
+        if indexes is None:
+            indexes = build_indexes(self.courses, self.study_plan)
+        self.course_levels = MappingProxyType(indexes["course_levels"])
+        self.plan_positions = MappingProxyType(indexes["plan_positions"])
+        self.plan_credits = tuple(indexes["plan_credits"])
+        self.courses_by_type = MappingProxyType(indexes["courses_by_type"])
+        self.prerequisite_closure = MappingProxyType(indexes["prerequisite_closure"])
+        self.prerequisite_depth = MappingProxyType(indexes["prerequisite_depth"])
+
+        bitsets = _index_bitsets(self.courses)
+        self.course_codes = bitsets["course_codes"]
+        self.course_ids = MappingProxyType(bitsets["course_ids"])
+        self.prerequisite_ids = bitsets["prerequisite_ids"]
+        self.prerequisite_masks = bitsets["prerequisite_masks"]
+        self.external_prerequisites = MappingProxyType(bitsets["external_prerequisites"])
+        self.semester_masks = MappingProxyType(bitsets["semester_masks"])
+        self.courses_by_semester = MappingProxyType({
+            semester: tuple(self.courses_in_mask(mask))
+            for semester, mask in self.semester_masks.items()
+        })
+
+    def course_level(self, code, default="level_1"):
+        """Study-plan level of a course"""
+        return self.course_levels.get(code, default)
+
+    def plan_credits_earned(self, passed):
+        """Study-plan credits covered by a set of passed course codes"""
+        return sum(credits for code, credits in self.plan_credits if code in passed)
+
+    def prerequisite_chain(self, code):
+        """All direct and indirect prerequisites of a course"""
+        return self.prerequisite_closure.get(code, ())
+
+    def course_mask(self, codes):
+        """Bitmask of the catalog courses among codes; other codes are ignored"""
+        ids = self.course_ids
+        return mask_from_ids(ids[code] for code in codes if code in ids)
+
+    def courses_in_mask(self, mask):
+        """Course records of the set bits of mask, in catalog order"""
+        codes = self.course_codes
+        courses = self.courses
+        return [courses[codes[cid]] for cid in iter_bits(mask)]
+
+
+def _read_sources():
+    """Raw bytes of every source file and their combined content hash"""
+    raws = []
+    digest = hashlib.sha1()
+    for path in _source_paths():
+        with open(path, "rb") as f:
+            raw = f.read()
+        digest.update(raw)
+        raws.append(raw)
+    return raws, digest.hexdigest()
+
+
+def _parse_sources(raws):
+    """Type-tagged courses, policies and study plan from the raw source files"""
+    courses = {}
+    for (path, course_type), raw in zip(COURSE_SOURCES, raws):
+        for course in json.loads(raw.decode("utf-8")):
+            course = dict(course)
+            course["type"] = course_type
+            courses[course["code"]] = course
+
+    policies = json.loads(raws[-2].decode("utf-8"))
+    study_plan = json.loads(raws[-1].decode("utf-8"))
+    return courses, policies, study_plan
+
+
+def _load_snapshot(path, stamp):
+    """Catalog from a compiled snapshot, or None if it is missing or stale.
+
+    A snapshot is current when its source stamp matches; if the stamps
+    differ (files touched, tree moved or checked out again) the sources
+    are hashed and the snapshot is still used when their content is
+    unchanged.
+    """
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.loads(f.read())
+        if snapshot["format"] != SNAPSHOT_FORMAT:
+            return None
+        if snapshot["stamp"] != stamp and snapshot["version"] != _read_sources()[1]:
+            return None
+        return Catalog(snapshot["courses"], snapshot["policies"], snapshot["study_plan"],
+                       snapshot["version"], stamp, snapshot["indexes"])
+    except (OSError, EOFError, pickle.UnpicklingError, KeyError, TypeError, ValueError, AttributeError):
+        return None
+
+
+def load_catalog(snapshot_path=SNAPSHOT_PATH):
+    """Build a fresh Catalog, from the compiled snapshot when it is current.
+
+    Falls back to parsing the JSON sources when there is no snapshot or it
+    no longer matches them. Pass snapshot_path=None to always parse.
+    """
+    stamp = _source_stamp()
+    if snapshot_path:
+        catalog = _load_snapshot(snapshot_path, stamp)
+        if catalog is not None:
+            return catalog
+
+    raws, version = _read_sources()
+    courses, policies, study_plan = _parse_sources(raws)
+    return Catalog(courses, policies, study_plan, version, stamp)
+
+
+def compile_snapshot(path=SNAPSHOT_PATH):
+    """Compile the JSON sources and their indexes into one pickle file.
+
+    The snapshot is only ever read back by load_catalog(), and only from
+    this data directory, so it is as trusted as the JSON it came from.
+    Returns the catalog version (content hash) it was built from.
+    """
+    stamp = _source_stamp()
+    raws, version = _read_sources()
+    courses, policies, study_plan = _parse_sources(raws)
+    snapshot = {
+        "format": SNAPSHOT_FORMAT,
+        "version": version,
+        "stamp": stamp,
+        "courses": courses,
+        "policies": policies,
+        "study_plan": study_plan,
+        "indexes": build_indexes(courses, study_plan)
+    }
+
+    # Write to a temp file first so a reader never sees a partial snapshot
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+    return version
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog():
+    """Return the process-wide catalog, reloading it if a source file changed"""
+    global _catalog
+    current = _catalog
+    if current is not None and current.stamp == _source_stamp():
+        return current
+
+    with _catalog_lock:
+        # Another thread may have reloaded while we waited for the lock
+        if _catalog is None or _catalog.stamp != _source_stamp():
+            _catalog = load_catalog()
+        return _catalog
+
+
+def invalidate_catalog():
+    """Drop the cached catalog so the next get_catalog() call reloads it"""
+    global _catalog
+    with _catalog_lock:
+        _catalog = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Course catalog maintenance.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Compile the JSON sources into a binary snapshot")
+    build.add_argument("-o", "--output", default=SNAPSHOT_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        version = compile_snapshot(args.output)
+        print(f"✅ Compiled catalog {version[:12]} into {args.output}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
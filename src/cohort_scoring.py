@@ -0,0 +1,130 @@
+# src/cohort_scoring.py
+
+import threading
+
+import numpy as np
+
+from advising import TYPE_PRIORITY, AdvisingPipeline, eligible_course_masks
+from catalog import LEVELS, get_catalog, iter_bits
+
+# Students scored per matrix in rank_cohort(); bounds memory to
+# chunk × courses × 8 bytes
+DEFAULT_CHUNK_SIZE = 512
+
+
+class CourseFeatures:
+    """Per-course feature columns of one catalog snapshot, in course-id order.
+
+    static is the student-independent part of the priority (type weight,
+    prerequisite chain length and credits), level is each course's index
+    in LEVELS and offered(semester) flags the courses run that semester.
+    Use features_for() to get the shared instance for the current catalog.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        records = [catalog.courses[code] for code in catalog.course_codes]
+        self.type_weight = np.array([TYPE_PRIORITY.get(c.type, 0) for c in records], dtype=np.int64)
+        self.chain_length = np.array([len(catalog.prerequisite_chain(c.code)) for c in records],
+                                     dtype=np.int64)
+        self.credits = np.array([c.credits for c in records], dtype=np.int64)
+        self.level = np.array([LEVELS.index(catalog.course_level(c.code)) for c in records],
+                              dtype=np.int8)
+        self.static = self.type_weight + self.chain_length * 50 + self.credits * 10
+
+        self._offered = {}
+        for semester, mask in catalog.semester_masks.items():
+            column = np.zeros(len(records), dtype=bool)
+            column[list(iter_bits(mask))] = True
+            self._offered[semester] = column
+        self._never = np.zeros(len(records), dtype=bool)
+
+    def offered(self, semester):
+        return self._offered.get(semester, self._never)
+
+
+_features = None
+_features_lock = threading.Lock()
+
+
+def features_for(catalog=None):
+    """Shared feature columns for the current catalog, rebuilt when it changes"""
+    global _features
+    catalog = catalog or get_catalog()
+    features = _features
+    if features is not None and features.catalog is catalog:
+        return features
+    with _features_lock:
+        if _features is None or _features.catalog is not catalog:
+            _features = CourseFeatures(catalog)
+        return _features
+
+
+def score_matrix(students, catalog=None):
+    """Priority of every catalog course for every student, in one array.
+
+    students are dicts with passed, failed and semester (as produced by
+    batch_advising.normalize_record). Entry [s, cid] equals the score
+    AdvisingPipeline._get_course_priorities gives course cid (see
+    Catalog.course_ids) for student s.
+    """
+    features = features_for(catalog)
+    catalog = features.catalog
+    pipeline = AdvisingPipeline()
+    count = len(students)
+    ids = catalog.course_ids
+
+    current = np.empty(count, dtype=np.int8)
+    following = np.empty(count, dtype=np.int8)
+    previous = np.empty(count, dtype=np.int8)
+    failed = np.zeros((count, len(catalog.course_codes)), dtype=bool)
+    offered = np.empty_like(failed)
+    for s, student in enumerate(students):
+        earned = catalog.plan_credits_earned(frozenset(student["passed"]))
+        level = pipeline._get_level_for_credits(earned)
+        current[s] = LEVELS.index(level)
+        following[s] = LEVELS.index(pipeline._get_next_level(level))
+        previous[s] = LEVELS.index(pipeline._get_previous_level(level))
+        failed[s, [ids[code] for code in student["failed"] if code in ids]] = True
+        offered[s] = features.offered(student["semester"])
+
+    # Same precedence as the scalar if/elif chain
+    level = features.level[np.newaxis, :]
+    level_points = np.where(level == current[:, np.newaxis], 500,
+                   np.where(level == following[:, np.newaxis], 300,
+                   np.where(level == previous[:, np.newaxis], 100, 0)))
+
+    return features.static[np.newaxis, :] + level_points + failed * 1000 + offered * 100
+
+
+def rank_cohort(students, catalog=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Eligible courses of every student, highest priority first.
+
+    Gives the same lists, in the same order, as running
+    _filter_eligible_courses and _sort_courses_by_priority for each
+    student, but eligibility and scores are computed for a chunk of
+    students at a time.
+    """
+    features = features_for(catalog)
+    catalog = features.catalog
+    codes = catalog.course_codes
+    students = list(students)
+    ranked = []
+
+    for start in range(0, len(students), chunk_size):
+        chunk = students[start:start + chunk_size]
+        scores = score_matrix(chunk, catalog)
+
+        masks = [0] * len(chunk)
+        for semester in {student["semester"] for student in chunk}:
+            members = [i for i, student in enumerate(chunk) if student["semester"] == semester]
+            eligible = eligible_course_masks([chunk[i]["passed"] for i in members], semester, catalog)
+            for i, mask in zip(members, eligible):
+                masks[i] = mask
+
+        for i, mask in enumerate(masks):
+            cids = np.fromiter(iter_bits(mask), dtype=np.intp)
+            # Stable, so ties keep catalog order like the scalar sort
+            order = cids[np.argsort(-scores[i, cids], kind="stable")]
+            ranked.append([catalog.courses[codes[cid]] for cid in order])
+    return ranked
@@ -0,0 +1,236 @@
+# src/graduation_planner.py
+
+import re
+import threading
+
+from advising import AdvisingPipeline
+from catalog import get_catalog
+
+# Terms of the academic year in calendar order
+TERM_CYCLE = ("Fall", "Spring", "Summer")
+
+# Study-plan placeholder types that map to a differently named course type
+PLACEHOLDER_TYPES = {"track_elective": "elective"}
+
+# Prerequisites such as "Completion of 90 credits" are credit thresholds
+CREDIT_THRESHOLD = re.compile(r"completion of (\d+) credits", re.IGNORECASE)
+
+# Stop planning after this many terms even if courses remain
+MAX_TERMS = 30
+
+
+def _credit_threshold(prereq):
+    match = CREDIT_THRESHOLD.fullmatch(prereq.strip())
+    return int(match.group(1)) if match else None
+
+
+class GraduationPlanner:
+    """Semester-by-semester plan to graduation for one catalog snapshot.
+
+    Everything that depends only on the catalog (required courses, elective
+    slots, candidate order) is worked out once here; plan() then only does
+    the per-student scheduling. Use planner_for() to get the shared planner
+    for the current catalog.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        courses = catalog.courses
+
+        # Plan entries that name a real course are required as-is; the rest
+        # (UC1, UE2, E3, ...) are slots to fill with a course of that type
+        self.required = []
+        self.slots = {}
+        for code, _ in catalog.plan_credits:
+            if code in courses:
+                if code not in self.required:
+                    self.required.append(code)
+                continue
+            plan_type = self._plan_entry_type(code)
+            slot_type = PLACEHOLDER_TYPES.get(plan_type, plan_type)
+            self.slots[slot_type] = self.slots.get(slot_type, 0) + 1
+
+        # Zero-credit courses are required for graduation too
+        for code, course in courses.items():
+            if course.type == "zero_credit" and code not in self.required:
+                self.required.append(code)
+
+        # Order in which a schedulable course is considered within a term
+        self.order = {}
+        for code, _ in catalog.plan_credits:
+            self.order.setdefault(code, len(self.order))
+        for code in courses:
+            self.order.setdefault(code, len(self.order))
+
+        self.schedulable = {}
+        for code in courses:
+            self._is_schedulable(code)
+
+    def _plan_entry_type(self, code):
+        position = self.catalog.plan_positions[code]
+        level, semester, slot = position
+        return self.catalog.study_plan[level][semester]["courses"][slot].get("type")
+
+    def _is_schedulable(self, code):
+        """Whether every prerequisite, transitively, is a course or a credit threshold"""
+        if code in self.schedulable:
+            return self.schedulable[code]
+        # A course on a prerequisite cycle can never be scheduled
+        self.schedulable[code] = False
+        result = True
+        for prereq in self.catalog.courses[code].prerequisites:
+            if _credit_threshold(prereq) is not None:
+                continue
+            if prereq not in self.catalog.courses or not self._is_schedulable(prereq):
+                result = False
+                break
+        self.schedulable[code] = result
+        return result
+
+    def _requirements(self, passed, failed):
+        """Courses this student still needs, with elective slots filled"""
+        courses = self.catalog.courses
+        needed = [code for code in self.required if code not in passed]
+
+        for slot_type, count in self.slots.items():
+            taken = sum(1 for code in passed
+                        if code in courses and courses[code].type == slot_type)
+            candidates = sorted(
+                (code for code, course in courses.items()
+                 if course.type == slot_type and code not in passed
+                 and code not in needed and self.schedulable[code]),
+                key=lambda code: (code not in failed,
+                                  self.catalog.prerequisite_depth.get(code, 0),
+                                  self.order[code])
+            )
+            needed.extend(candidates[:max(0, count - taken)])
+
+        # Pull in unmet prerequisites of anything chosen
+        for code in list(needed):
+            for prereq in self.catalog.prerequisite_chain(code):
+                if prereq in courses and prereq not in passed and prereq not in needed:
+                    needed.append(prereq)
+        return needed
+
+    def plan(self, cgpa, passed, failed=(), start_semester="Fall"):
+        """Build the schedule for one student.
+
+        Courses are placed term by term (list scheduling over the
+        prerequisite DAG): a course is ready once all its prerequisites are
+        in earlier terms and it is offered that term. Ready courses are
+        taken failed-first, then by the length of the chain of remaining
+        courses that depend on them, then in study-plan order, up to the
+        CGPA's credit limit.
+        """
+        courses = self.catalog.courses
+        passed = set(passed)
+        failed = frozenset(failed)
+        start_semester = start_semester.strip().title()
+        if start_semester not in TERM_CYCLE:
+            raise ValueError(f"Unknown semester: {start_semester}")
+
+        credit_limit = AdvisingPipeline()._get_credit_limit(cgpa, self.catalog.policies)
+        remaining = set(self._requirements(passed, failed))
+        earned = sum(courses[code].credits for code in passed if code in courses)
+
+        # Longest chain of remaining courses that depend on each course
+        dependents = {code: [] for code in remaining}
+        for code in remaining:
+            for prereq in courses[code].prerequisites:
+                if prereq in dependents:
+                    dependents[prereq].append(code)
+        heights = {}
+
+        def height(code):
+            if code not in heights:
+                heights[code] = 1 + max((height(d) for d in dependents[code]), default=0)
+            return heights[code]
+
+        def ready(code, term):
+            course = courses[code]
+            if not course.offered_in(term):
+                return False
+            for prereq in course.prerequisites:
+                threshold = _credit_threshold(prereq)
+                if threshold is not None:
+                    if earned < threshold:
+                        return False
+                elif prereq not in passed:
+                    return False
+            return True
+
+        semesters = []
+        idle_terms = 0
+        term_index = TERM_CYCLE.index(start_semester)
+        year = 1
+        for _ in range(MAX_TERMS):
+            if not remaining or idle_terms >= len(TERM_CYCLE):
+                break
+            term = TERM_CYCLE[term_index]
+            candidates = sorted(
+                (code for code in remaining if ready(code, term)),
+                key=lambda code: (code not in failed, -height(code), self.order[code])
+            )
+
+            taken = []
+            credits = 0
+            for code in candidates:
+                if credits + courses[code].credits <= credit_limit:
+                    taken.append(code)
+                    credits += courses[code].credits
+
+            if taken:
+                semesters.append({
+                    "Year": year,
+                    "Semester": term,
+                    "Courses": [self._row(code) for code in taken],
+                    "Credits": credits
+                })
+                remaining.difference_update(taken)
+                passed.update(taken)
+                earned += credits
+                idle_terms = 0
+            else:
+                idle_terms += 1
+
+            term_index = (term_index + 1) % len(TERM_CYCLE)
+            if term_index == 0:
+                year += 1
+
+        return {
+            "credit_limit": credit_limit,
+            "semesters": semesters,
+            "total_credits": sum(s["Credits"] for s in semesters),
+            "unscheduled": sorted(remaining, key=self.order.__getitem__)
+        }
+
+    def _row(self, code):
+        course = self.catalog.courses[code]
+        return {
+            "Course Code": code,
+            "Course Name": course.name,
+            "Credits": course.credits,
+            "Type": course.type.value
+        }
+
+
+_planner = None
+_planner_lock = threading.Lock()
+
+
+def planner_for(catalog=None):
+    """Shared planner for the current catalog, rebuilt when the catalog changes"""
+    global _planner
+    catalog = catalog or get_catalog()
+    planner = _planner
+    if planner is not None and planner.catalog is catalog:
+        return planner
+    with _planner_lock:
+        if _planner is None or _planner.catalog is not catalog:
+            _planner = GraduationPlanner(catalog)
+        return _planner
+
+
+def plan_graduation(cgpa, passed_courses, failed_courses=(), start_semester="Fall"):
+    """Semester-by-semester schedule to graduation for one student"""
+    return planner_for().plan(cgpa, passed_courses, failed_courses, start_semester)
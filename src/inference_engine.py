@@ -1,9 +1,15 @@
 # src/inference_engine.py
 
 from experta import *
-import json
-import os
-from datetime import datetime
+import copy
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from advising import AdvisingPipeline, recommend, recommendation_row
+from catalog import get_catalog
+from instrumentation import NULL_TRACE, finish_trace, start_trace
 
 # Fact to represent student input
 class StudentProfile(Fact):
@@ -14,10 +20,10 @@ class StudentProfile(Fact):
     semester: str
 
 class Course(Fact):
-    """Course information"""
+    """A recommended course, identified by its catalog code"""
     pass
 
-class CourseAdvisor(KnowledgeEngine):
+class CourseAdvisor(AdvisingPipeline, KnowledgeEngine):
     @DefFacts()
     def _initial_facts(self):
         yield InitialFact()
@@ -31,373 +37,446 @@ class CourseAdvisor(KnowledgeEngine):
         )
     )
     def recommend_courses(self, cgpa, passed, failed, semester):
-        # Load all course data
-        courses = self._load_courses()
-        policies = self._load_policies()
-        study_plan = self._load_study_plan()
-
-        # Get credit limit based on CGPA
-        credit_limit = self._get_credit_limit(cgpa, policies)
-        
-        # Get available courses for the semester
-        available_courses = self._get_available_courses(courses, semester)
-        
-        # Filter courses based on prerequisites and failed courses
-        eligible_courses = self._filter_eligible_courses(
-            available_courses,
-            passed,
-            failed,
-            study_plan
-        )
-        
-        # Sort courses by priority with enhanced logic
-        sorted_courses = self._sort_courses_by_priority(
-            eligible_courses,
-            passed,
-            failed,
-            study_plan,
-            semester
-        )
-        
-        # Select courses within credit limit
-        selected_courses = self._select_courses_within_limit(
-            sorted_courses,
-            credit_limit
-        )
+        selected_courses = self.run_pipeline(cgpa, passed, failed, semester)
         
-        # Generate detailed explanations
-        explanations = self._generate_explanations(
-            selected_courses,
-            passed,
-            failed,
-            study_plan,
-            semester
-        )
-        
-        # Declare recommendations
+        # Declare recommendations; course details stay in the catalog record
         for course in selected_courses:
-            self.declare(
-                Course(
-                    code=course["code"],
-                    name=course["name"],
-                    credits=course["credits"],
-                    type=course.get("type", "core"),
-                    semester=course["semester_offered"][0],
-                    level=course.get("level", self._get_course_level(course["code"], study_plan))
+            self.declare(Course(code=course.code))
+
+# Engines kept for advise_with_engine; change with configure_engine_pool()
+DEFAULT_POOL_SIZE = 8
+
+class EnginePool:
+    """Thread-safe pool of reusable CourseAdvisor engines.
+
+    acquire() lends an engine to one request at a time (release() returns
+    it, or use checkout() as a context manager) and blocks while all size
+    engines are busy. Engines are built on first demand and
+    reset() on every checkout, so experta's rule network is built once per
+    engine instead of once per request. info() reports checkout counts and
+    how long requests waited for an engine.
+    """
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, factory=CourseAdvisor):
+        if size < 1:
+            raise ValueError("Engine pool size must be at least 1")
+        self.size = size
+        self._factory = factory
+        self._idle = []
+        self._created = 0
+        # Waiting requests, served first come first served
+        self._waiters = deque()
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def acquire(self):
+        """Take a freshly reset engine, waiting while the pool is exhausted"""
+        started = time.perf_counter()
+        waiter = None
+        engine = None
+        with self._lock:
+            if self._idle:
+                engine = self._idle.pop()
+            elif self._created < self.size:
+                self._created += 1
+            else:
+                waiter = [threading.Event(), None]
+                self._waiters.append(waiter)
+
+        if waiter is not None:
+            # release() hands its engine over directly (None: build one)
+            waiter[0].wait()
+            engine = waiter[1]
+        wait = time.perf_counter() - started
+        with self._lock:
+            self.checkouts += 1
+            self.waits += waiter is not None
+            self.wait_seconds += wait
+            self.max_wait_seconds = max(self.max_wait_seconds, wait)
+
+        try:
+            if engine is None:
+                engine = self._factory()
+            engine.reset()
+        except BaseException:
+            self._hand_over(None)
+            raise
+        return engine
+
+    def release(self, engine):
+        """Give an engine back after acquire()"""
+        # Per-request settings must not leak into the next request
+        engine.__dict__.pop("_trace", None)
+        engine.__dict__.pop("selection", None)
+        self._hand_over(engine)
+
+    def _hand_over(self, engine):
+        """Pass an engine (or, if None, the right to build one) to the next waiter"""
+        with self._lock:
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter[1] = engine
+                waiter[0].set()
+            elif engine is not None:
+                self._idle.append(engine)
+            else:
+                self._created -= 1
+
+    @contextmanager
+    def checkout(self):
+        engine = self.acquire()
+        try:
+            yield engine
+        finally:
+            self.release(engine)
+
+    def info(self):
+        """Checkout and wait-time counters"""
+        with self._lock:
+            return {
+                "size": self.size,
+                "created": self._created,
+                "idle": len(self._idle),
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "mean_wait_ms": self.wait_seconds / self.checkouts * 1000 if self.checkouts else 0.0,
+                "max_wait_ms": self.max_wait_seconds * 1000
+            }
+
+
+_engine_pool = None
+_engine_pool_lock = threading.Lock()
+
+
+def get_engine_pool():
+    """Process-wide engine pool shared by every session"""
+    global _engine_pool
+    with _engine_pool_lock:
+        if _engine_pool is None:
+            _engine_pool = EnginePool()
+        return _engine_pool
+
+
+def configure_engine_pool(size):
+    """Replace the shared pool with one of the given size"""
+    global _engine_pool
+    with _engine_pool_lock:
+        _engine_pool = EnginePool(size)
+
+
+def engine_pool_info():
+    return get_engine_pool().info()
+
+# Facts of the incremental advisor: one per course the student passed or
+# failed, and one per catalog offering and prerequisite
+class Term(Fact):
+    """A semester the student has been advised for"""
+    pass
+
+class Standing(Fact):
+    """Student's current study-plan level"""
+    pass
+
+class Passed(Fact):
+    pass
+
+class Failed(Fact):
+    pass
+
+class Offered(Fact):
+    """A catalog course runs in a semester"""
+    pass
+
+class Requires(Fact):
+    """A catalog course lists a prerequisite (a course code or other requirement)"""
+    pass
+
+class Missing(Fact):
+    """A prerequisite of a catalog course that the student has not passed"""
+    pass
+
+class Eligible(Fact):
+    """The student may register for a course in a semester"""
+    pass
+
+class Priority(Fact):
+    """Priority score of an eligible course in a semester, with the level and failed flag it was computed for"""
+    pass
+
+class IncrementalAdvisor(AdvisingPipeline, KnowledgeEngine):
+    """Rule engine kept alive across edits to one student's record.
+
+    Passed and failed courses and the catalog's offerings and prerequisites
+    are individual facts, and eligibility and priority are derived by rules.
+    pass_course(), fail_course(), drop_course() and set_cgpa() change
+    single facts, so the next advise() only re-fires the rules those facts
+    touch. Eligibility and priorities are kept per semester: set_semester()
+    to a semester seen before fires no rules, and a new one only derives
+    the courses offered in it. Derived facts are withdrawn by rules of
+    their own, since experta does not retract them automatically.
+    advise() returns the same (recommendations, explanations) as
+    advise_student for the current inputs.
+    """
+
+    def __init__(self, cgpa, passed, failed, semester, selection="greedy", catalog=None):
+        super().__init__()
+        self.selection = selection
+        self.catalog = catalog
+        self.cgpa = cgpa
+        self.semester = semester
+        self.passed = set(passed)
+        self.failed = set(failed)
+        self._facts = None
+
+    @DefFacts()
+    def _catalog_facts(self):
+        yield InitialFact()
+        for course in self._get_catalog().courses.values():
+            for semester in course.semester_offered:
+                yield Offered(code=course.code, semester=semester)
+            for prereq in course.prerequisites:
+                yield Requires(code=course.code, prereq=prereq)
+
+    # A prerequisite the student has not passed; settled before eligibility
+    @Rule(
+        Requires(code=MATCH.code, prereq=MATCH.prereq),
+        NOT(Passed(code=MATCH.prereq)),
+        NOT(Missing(code=MATCH.code, prereq=MATCH.prereq)),
+        salience=20
+    )
+    def prerequisite_missing(self, code, prereq):
+        self.declare(Missing(code=code, prereq=prereq))
+
+    @Rule(AS.fact << Missing(prereq=MATCH.prereq), Passed(code=MATCH.prereq), salience=20)
+    def prerequisite_passed(self, fact):
+        self.retract(fact)
+
+    @Rule(
+        Term(semester=MATCH.semester),
+        Offered(code=MATCH.code, semester=MATCH.semester),
+        NOT(Passed(code=MATCH.code)),
+        NOT(Missing(code=MATCH.code)),
+        NOT(Eligible(code=MATCH.code, semester=MATCH.semester))
+    )
+    def course_eligible(self, code, semester):
+        self.declare(Eligible(code=code, semester=semester))
+
+    @Rule(AS.fact << Eligible(code=MATCH.code), Passed(code=MATCH.code), salience=10)
+    def course_passed(self, fact):
+        self.retract(fact)
+
+    @Rule(AS.fact << Eligible(code=MATCH.code), Missing(code=MATCH.code), salience=10)
+    def course_blocked(self, fact):
+        self.retract(fact)
+
+    @Rule(
+        Eligible(code=MATCH.code, semester=MATCH.semester),
+        Standing(level=MATCH.level),
+        Failed(code=MATCH.code),
+        NOT(Priority(code=MATCH.code, semester=MATCH.semester))
+    )
+    def score_failed_course(self, code, semester, level):
+        self._declare_priority(code, semester, level, True)
+
+    @Rule(
+        Eligible(code=MATCH.code, semester=MATCH.semester),
+        Standing(level=MATCH.level),
+        NOT(Failed(code=MATCH.code)),
+        NOT(Priority(code=MATCH.code, semester=MATCH.semester))
+    )
+    def score_course(self, code, semester, level):
+        self._declare_priority(code, semester, level, False)
+
+    @Rule(
+        AS.fact << Priority(code=MATCH.code, semester=MATCH.semester),
+        NOT(Eligible(code=MATCH.code, semester=MATCH.semester)),
+        salience=10
+    )
+    def priority_ineligible(self, fact):
+        self.retract(fact)
+
+    @Rule(
+        AS.fact << Priority(level=MATCH.scored_level),
+        Standing(level=MATCH.level),
+        TEST(lambda scored_level, level: scored_level != level),
+        salience=10
+    )
+    def priority_level_changed(self, fact):
+        self.retract(fact)
+
+    @Rule(AS.fact << Priority(code=MATCH.code, failed=True), NOT(Failed(code=MATCH.code)), salience=10)
+    def priority_no_longer_failed(self, fact):
+        self.retract(fact)
+
+    @Rule(AS.fact << Priority(code=MATCH.code, failed=False), Failed(code=MATCH.code), salience=10)
+    def priority_now_failed(self, fact):
+        self.retract(fact)
+
+    def _declare_priority(self, code, semester, level, failed):
+        course = self._get_catalog().courses[code]
+        context = self._context
+        if context.semester != semester:
+            # An edit re-scoring a course for a semester visited earlier
+            context = copy.copy(context)
+            context.semester = semester
+        score = self._get_course_priorities([course], context)[0]
+        self.declare(Priority(code=code, semester=semester, level=level, failed=failed, score=score))
+
+    def pass_course(self, code):
+        self.failed.discard(code)
+        self.passed.add(code)
+        if self._facts is not None:
+            self._retract_student_fact(Failed, code)
+            self._declare_student_fact(Passed, code)
+
+    def fail_course(self, code):
+        self.passed.discard(code)
+        self.failed.add(code)
+        if self._facts is not None:
+            self._retract_student_fact(Passed, code)
+            self._declare_student_fact(Failed, code)
+
+    def drop_course(self, code):
+        self.passed.discard(code)
+        self.failed.discard(code)
+        if self._facts is not None:
+            self._retract_student_fact(Passed, code)
+            self._retract_student_fact(Failed, code)
+
+    def set_cgpa(self, cgpa):
+        # Only the credit limit depends on the CGPA; no facts change
+        self.cgpa = cgpa
+
+    def set_semester(self, semester):
+        self.semester = semester
+        if self._facts is not None and (Term, semester) not in self._facts:
+            # Earlier terms stay, so their eligibility is kept up to date
+            self._facts[Term, semester] = self.declare(Term(semester=semester))
+
+    def _declare_student_fact(self, kind, code):
+        if (kind, code) not in self._facts:
+            self._facts[kind, code] = self.declare(kind(code=code))
+
+    def _retract_student_fact(self, kind, code):
+        fact = self._facts.pop((kind, code), None)
+        if fact is not None:
+            self.retract(fact)
+
+    def _start(self):
+        """Build the working memory from scratch (first run or a new catalog)"""
+        self._pin_catalog()
+        self.reset()
+        self._facts = {}
+        for code in self.passed:
+            self._declare_student_fact(Passed, code)
+        for code in self.failed:
+            self._declare_student_fact(Failed, code)
+        self._facts[Term, self.semester] = self.declare(Term(semester=self.semester))
+        self._facts[Standing] = None
+
+    def advise(self):
+        """Recommendations and explanations for the current inputs"""
+        trace = start_trace("incremental")
+        self._trace = trace
+        try:
+            with trace.stage("load"):
+                if self._facts is None or (self.catalog is None and get_catalog() is not self._catalog):
+                    self._start()
+                catalog = self._get_catalog()
+                context = self._build_student_context(self.cgpa, self.passed, self.failed, self.semester)
+                standing = self._facts[Standing]
+                if standing is None:
+                    self._facts[Standing] = self.declare(Standing(level=context.current_level))
+                elif standing["level"] != context.current_level:
+                    self._facts[Standing] = self.modify(standing, level=context.current_level)
+
+            with trace.stage("engine_run"):
+                self.run()
+
+            with trace.stage("sort"):
+                ids = catalog.course_ids
+                semester = self.semester
+                scored = sorted(
+                    (fact for fact in self.facts.values()
+                     if isinstance(fact, Priority) and fact["semester"] == semester),
+                    key=lambda fact: (-fact["score"], ids[fact["code"]])
                 )
-            )
+                sorted_courses = [catalog.courses[fact["code"]] for fact in scored]
 
-    def _load_courses(self):
-        """Load all course data from JSON files"""
-        courses = {}
-        
-        # Load core courses
-        with open("data/Courses/Core_courses.json", "r") as f:
-            core_courses = json.load(f)
-            for course in core_courses:
-                course["type"] = "core"
-                courses[course["code"]] = course
-        
-        # Load graduation courses
-        with open("data/Courses/Graduation_courses.json", "r") as f:
-            grad_courses = json.load(f)
-            for course in grad_courses:
-                course["type"] = "graduation"
-                courses[course["code"]] = course
-        
-        # Load field training courses
-        with open("data/Courses/FT_courses.json", "r") as f:
-            ft_courses = json.load(f)
-            for course in ft_courses:
-                course["type"] = "field_training"
-                courses[course["code"]] = course
-        
-        # Load elective courses
-        with open("data/Courses/Electives/Elective_courses.json", "r") as f:
-            elective_courses = json.load(f)
-            for course in elective_courses:
-                course["type"] = "elective"
-                courses[course["code"]] = course
-        
-        # Load university requirements
-        with open("data/Courses/UniReq/Compulsory_unireq.json", "r") as f:
-            compulsory_courses = json.load(f)
-            for course in compulsory_courses:
-                course["type"] = "university_compulsory"
-                courses[course["code"]] = course
-        
-        with open("data/Courses/UniReq/Elective_unireq.json", "r") as f:
-            elective_uni_courses = json.load(f)
-            for course in elective_uni_courses:
-                course["type"] = "university_elective"
-                courses[course["code"]] = course
-        
-        with open("data/Courses/UniReq/Zero_unireq.json", "r") as f:
-            zero_courses = json.load(f)
-            for course in zero_courses:
-                course["type"] = "zero_credit"
-                courses[course["code"]] = course
-        
-        return courses
-
-    def _load_policies(self):
-        """Load university policies"""
-        with open("data/Policies.json", "r") as f:
-            return json.load(f)
-
-    def _load_study_plan(self):
-        """Load study plan"""
-        with open("data/StudyPlan.json", "r") as f:
-            return json.load(f)
-
-    def _get_credit_limit(self, cgpa, policies):
-        """Get maximum allowed credits based on CGPA"""
-        for limit in policies["credit_limits"]:
-            if (limit["cgpa_min"] <= cgpa < limit["cgpa_max"] if limit["exclusive_max"]
-                else limit["cgpa_min"] <= cgpa <= limit["cgpa_max"]):
-                return limit["max_credits"]
-        return 12  # Default limit
-
-    def _get_available_courses(self, courses, semester):
-        """Get courses available in the given semester"""
-        return [
-            course for course in courses.values()
-            if semester in course["semester_offered"]
-        ]
-
-    def _filter_eligible_courses(self, courses, passed, failed, study_plan):
-        """Filter courses based on prerequisites and failed courses"""
-        eligible = []
-        for course in courses:
-            # Skip if course is already passed
-            if course["code"] in passed:
-                continue
-                
-            # Check prerequisites
-            prereqs_met = True
-            if "prerequisites" in course:
-                for prereq in course["prerequisites"]:
-                    if prereq not in passed:
-                        prereqs_met = False
-                        break
-            
-            if prereqs_met:
-                eligible.append(course)
-        
-        return eligible
-
-    def _get_course_level(self, course_code, study_plan):
-        """Get the level of a course from the study plan"""
-        for level in ["level_1", "level_2", "level_3", "level_4"]:
-            for semester in ["fall", "spring"]:
-                for course in study_plan[level][semester]["courses"]:
-                    if course["code"] == course_code:
-                        return level
-        return "level_1"  # Default level
-
-    def _get_student_level(self, passed, study_plan):
-        """Determine student's current level based on passed courses"""
-        total_credits = 0
-        for level in ["level_1", "level_2", "level_3", "level_4"]:
-            for semester in ["fall", "spring"]:
-                for course in study_plan[level][semester]["courses"]:
-                    if course["code"] in passed:
-                        total_credits += course["credits"]
-        
-        if total_credits < 30:
-            return "level_1"
-        elif total_credits < 60:
-            return "level_2"
-        elif total_credits < 90:
-            return "level_3"
-        else:
-            return "level_4"
-
-    def _sort_courses_by_priority(self, courses, passed, failed, study_plan, semester):
-        """Enhanced course prioritization based on multiple factors"""
-        def get_course_priority(course):
-            priority = 0
-            current_level = self._get_student_level(passed, study_plan)
-            course_level = self._get_course_level(course["code"], study_plan)
-            
-            # 1. Failed courses get highest priority (1000 points)
-            if course["code"] in failed:
-                priority += 1000
-            
-            # 2. Level-based priority (500 points)
-            if course_level == current_level:
-                priority += 500
-            elif course_level == self._get_next_level(current_level):
-                priority += 300
-            elif course_level == self._get_previous_level(current_level):
-                priority += 100
-            
-            # 3. Course type priority
-            course_type = course.get("type", "core")
-            if course_type == "core":
-                priority += 200
-            elif course_type == "university_compulsory":
-                priority += 150
-            elif course_type == "field_training":
-                priority += 100
-            elif course_type == "graduation":
-                priority += 90
-            elif course_type == "elective":
-                priority += 80
-            elif course_type == "university_elective":
-                priority += 70
-            elif course_type == "zero_credit":
-                priority += 60
-            
-            # 4. Semester alignment (100 points)
-            if semester in course["semester_offered"]:
-                priority += 100
-            
-            # 5. Prerequisite chain priority (50 points per level)
-            prereq_chain = self._get_prerequisite_chain(course["code"], study_plan)
-            priority += len(prereq_chain) * 50
-            
-            # 6. Credit hours priority (10 points per credit)
-            priority += course["credits"] * 10
-            
-            return priority
-        
-        return sorted(courses, key=get_course_priority, reverse=True)
-
-    def _get_next_level(self, current_level):
-        """Get the next level in sequence"""
-        levels = ["level_1", "level_2", "level_3", "level_4"]
-        current_index = levels.index(current_level)
-        return levels[current_index + 1] if current_index < len(levels) - 1 else current_level
-
-    def _get_previous_level(self, current_level):
-        """Get the previous level in sequence"""
-        levels = ["level_1", "level_2", "level_3", "level_4"]
-        current_index = levels.index(current_level)
-        return levels[current_index - 1] if current_index > 0 else current_level
-
-    def _get_prerequisite_chain(self, course_code, study_plan):
-        """Get the chain of prerequisites for a course"""
-        chain = []
-        courses = self._load_courses()
-        
-        def add_prereqs(code):
-            if code in courses and "prerequisites" in courses[code]:
-                for prereq in courses[code]["prerequisites"]:
-                    if prereq not in chain:
-                        chain.append(prereq)
-                        add_prereqs(prereq)
-        
-        add_prereqs(course_code)
-        return chain
+            with trace.stage("select"):
+                if self.selection == "optimal":
+                    selected = self._select_courses_optimal(sorted_courses, context)
+                else:
+                    selected = self._select_courses_within_limit(sorted_courses, context.credit_limit)
 
-    def _select_courses_within_limit(self, courses, credit_limit):
-        """Select courses within the credit limit"""
-        selected = []
-        total_credits = 0
-        
-        for course in courses:
-            if total_credits + course["credits"] <= credit_limit:
-                selected.append(course)
-                total_credits += course["credits"]
-        
-        return selected
+            with trace.stage("explain"):
+                recommendations = [recommendation_row(course, catalog) for course in selected]
+                explanations = self._generate_explanations(selected, context)
+            trace.note(catalog_version=catalog.version, selection=self.selection,
+                       facts=len(self.facts), eligible=len(scored), selected=len(selected))
+            return recommendations, explanations
+        finally:
+            self._trace = NULL_TRACE
+            finish_trace(trace)
 
-    def _generate_explanations(self, courses, passed, failed, study_plan, semester):
-        """Generate detailed explanations for course recommendations"""
-        explanations = []
-        current_level = self._get_student_level(passed, study_plan)
-        
-        for course in courses:
-            explanation = f"Recommended {course['code']} ({course['name']}) because:"
-            
-            # Failed course explanation
-            if course["code"] in failed:
-                explanation += " You need to retake this failed course."
-            
-            # Prerequisites explanation
-            if "prerequisites" in course:
-                prereqs = ", ".join(course["prerequisites"])
-                explanation += f" You have completed the prerequisites ({prereqs})."
-            
-            # Course type explanation
-            course_type = course.get("type", "core")
-            if course_type == "core":
-                explanation += " This is a core course required for your degree."
-            elif course_type == "university_compulsory":
-                explanation += " This is a compulsory university requirement."
-            elif course_type == "field_training":
-                explanation += " This is a field training course required for practical experience."
-            elif course_type == "graduation":
-                explanation += " This is a graduation project/thesis course."
-            elif course_type == "elective":
-                explanation += " This is a technical elective course for your specialization."
-            elif course_type == "university_elective":
-                explanation += " This is a university elective course to broaden your knowledge."
-            elif course_type == "zero_credit":
-                explanation += " This is a zero-credit course required for graduation."
-            
-            # Level explanation
-            course_level = self._get_course_level(course["code"], study_plan)
-            if course_level == current_level:
-                explanation += f" This course is part of your current level ({current_level})."
-            elif course_level == self._get_next_level(current_level):
-                explanation += f" This course is from the next level, but you have completed enough credits to take it."
-            elif course_level == self._get_previous_level(current_level):
-                explanation += f" This course is from a previous level that you haven't completed yet."
-            
-            # Semester explanation
-            if semester in course["semester_offered"]:
-                explanation += f" This course is offered in the {semester} semester."
+def advise_student(cgpa, passed_courses, failed_courses, semester,
+                   use_engine=False, selection="greedy"):
+    """Main function to get course recommendations
+
+    Runs the recommendation pipeline directly by default. Pass
+    use_engine=True to go through the experta rule engine instead; both
+    paths return identical recommendations and explanations. selection
+    is "greedy" (default) or "optimal" (see advising.SELECTION_MODES).
+    """
+    if use_engine:
+        return advise_with_engine(cgpa, passed_courses, failed_courses, semester, selection)
+    return recommend(cgpa, passed_courses, failed_courses, semester, selection)
+
+def advise_with_engine(cgpa, passed_courses, failed_courses, semester, selection="greedy"):
+    """Get course recommendations by running the CourseAdvisor rule engine"""
+    trace = start_trace("engine")
+    try:
+        pool = get_engine_pool()
+        with trace.stage("engine_checkout"):
+            # A pooled engine, already reset
+            engine = pool.acquire()
+        try:
+            with trace.stage("engine_setup"):
+                engine.selection = selection
+                engine._trace = trace
+                
+                # Declare student profile
+                engine.declare(
+                    StudentProfile(
+                        cgpa=cgpa,
+                        passed=passed_courses,
+                        failed=failed_courses,
+                        semester=semester
+                    )
+                )
             
-            # Credit hours explanation
-            if course_type != "zero_credit":
-                explanation += f" This course is worth {course['credits']} credit hours."
-            else:
-                explanation += " This is a zero-credit course."
+            # Run the engine (includes the pipeline stages fired by the rule)
+            with trace.stage("engine_run"):
+                engine.run()
             
-            explanations.append(explanation)
+            with trace.stage("explain"):
+                # Collect recommendations
+                catalog = engine._get_catalog()
+                selected_courses = [
+                    catalog.courses[fact["code"]]
+                    for fact in engine.facts.values()
+                    if isinstance(fact, Course)
+                ]
+                recommendations = [recommendation_row(course, catalog) for course in selected_courses]
+                
+                # Get explanations
+                explanations = engine._generate_explanations(selected_courses, engine._context)
+        finally:
+            pool.release(engine)
         
-        return explanations
-
-def advise_student(cgpa, passed_courses, failed_courses, semester):
-    """Main function to get course recommendations"""
-    engine = CourseAdvisor()
-    engine.reset()
-    
-    # Declare student profile
-    engine.declare(
-        StudentProfile(
-            cgpa=cgpa,
-            passed=passed_courses,
-            failed=failed_courses,
-            semester=semester
-        )
-    )
-    
-    # Run the engine
-    engine.run()
-    
-    # Collect recommendations
-    recommendations = []
-    for fact in engine.facts.values():
-        if isinstance(fact, Course):
-            recommendations.append({
-                "Course Code": fact["code"],
-                "Course Name": fact["name"],
-                "Credits": fact["credits"],
-                "Type": fact["type"],
-                "Semester": fact["semester"],
-                "Level": fact["level"]
-            })
-    
-    # Get explanations
-    explanations = engine._generate_explanations(
-        [engine._load_courses()[r["Course Code"]] for r in recommendations],
-        passed_courses,
-        failed_courses,
-        engine._load_study_plan(),
-        semester
-    )
-    
-    return recommendations, explanations
+        return recommendations, explanations
+    finally:
+        finish_trace(trace)
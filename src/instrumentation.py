@@ -0,0 +1,171 @@
+# src/instrumentation.py
+
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger("advisor.pipeline")
+
+# Opt-in through the environment so the Streamlit app needs no code change
+_enabled = os.environ.get("ADVISOR_INSTRUMENT", "") == "1"
+_profile = os.environ.get("ADVISOR_PROFILE", "") == "1"
+
+# Number of functions kept from each cProfile capture
+PROFILE_TOP = 25
+
+
+class RequestTrace:
+    """Stage timings and call counts of a single advising request"""
+
+    def __init__(self, mode, profile=False):
+        self.mode = mode
+        self.stages = {}
+        self.calls = {}
+        self.fields = {}
+        self.started = time.perf_counter()
+        self.profiler = cProfile.Profile() if profile else None
+        if self.profiler is not None:
+            self.profiler.enable()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    def count(self, name, amount=1):
+        self.calls[name] = self.calls.get(name, 0) + amount
+
+    def note(self, **fields):
+        """Attach extra fields to the request's log line"""
+        self.fields.update(fields)
+
+
+class _NullTrace:
+    """Stand-in used when instrumentation is off; every hook is a no-op"""
+
+    _null_stage = nullcontext()
+
+    def stage(self, name):
+        return self._null_stage
+
+    def count(self, name, amount=1):
+        pass
+
+    def note(self, **fields):
+        pass
+
+
+NULL_TRACE = _NullTrace()
+
+
+class PipelineStats:
+    """Aggregate of every finished trace in this process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.modes = {}
+            self.total_seconds = 0.0
+            self.max_seconds = 0.0
+            self.stages = {}
+            self.calls = {}
+            self.last_profile = None
+
+    def record(self, trace, total, profile_text=None):
+        with self._lock:
+            self.requests += 1
+            self.modes[trace.mode] = self.modes.get(trace.mode, 0) + 1
+            self.total_seconds += total
+            self.max_seconds = max(self.max_seconds, total)
+            for name, seconds in trace.stages.items():
+                stage = self.stages.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+                stage["count"] += 1
+                stage["total"] += seconds
+                stage["max"] = max(stage["max"], seconds)
+            for name, amount in trace.calls.items():
+                self.calls[name] = self.calls.get(name, 0) + amount
+            if profile_text is not None:
+                self.last_profile = profile_text
+
+    def snapshot(self):
+        """Plain-dict view, suitable for st.json or a log line"""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "modes": dict(self.modes),
+                "mean_ms": round(self.total_seconds / self.requests * 1000, 3) if self.requests else 0.0,
+                "max_ms": round(self.max_seconds * 1000, 3),
+                "stages": {
+                    name: {
+                        "count": stage["count"],
+                        "mean_ms": round(stage["total"] / stage["count"] * 1000, 3),
+                        "max_ms": round(stage["max"] * 1000, 3)
+                    }
+                    for name, stage in self.stages.items()
+                },
+                "calls": dict(self.calls)
+            }
+
+
+stats = PipelineStats()
+
+
+def enable_instrumentation(profile=False):
+    """Turn on per-request timing (and cProfile capture if profile=True)"""
+    global _enabled, _profile
+    _enabled = True
+    _profile = profile
+
+
+def disable_instrumentation():
+    global _enabled, _profile
+    _enabled = False
+    _profile = False
+
+
+def instrumentation_enabled():
+    return _enabled
+
+
+def start_trace(mode):
+    """Begin tracing one request; returns NULL_TRACE when instrumentation is off"""
+    if not _enabled:
+        return NULL_TRACE
+    return RequestTrace(mode, profile=_profile)
+
+
+def finish_trace(trace):
+    """Log one structured line for the request and fold it into the stats"""
+    if trace is NULL_TRACE:
+        return
+    total = time.perf_counter() - trace.started
+
+    profile_text = None
+    if trace.profiler is not None:
+        trace.profiler.disable()
+        buffer = io.StringIO()
+        pstats.Stats(trace.profiler, stream=buffer).sort_stats("cumulative").print_stats(PROFILE_TOP)
+        profile_text = buffer.getvalue()
+
+    stats.record(trace, total, profile_text)
+    logger.info(json.dumps(dict({
+        "event": "advise",
+        "mode": trace.mode,
+        "total_ms": round(total * 1000, 3),
+        "stages_ms": {name: round(s * 1000, 3) for name, s in trace.stages.items()},
+        "calls": trace.calls
+    }, **trace.fields)))
@@ -1,76 +1,43 @@
 # src/knowledge_base.py
 
-import os
-import json
-
-DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
-COURSES_DIR = os.path.join(DATA_DIR, 'Courses')
-ELECTIVES_DIR = os.path.join(COURSES_DIR, 'Electives')
-UNIREQ_DIR = os.path.join(COURSES_DIR, 'UniReq')
-
-def load_json(path):
-    with open(path, "r", encoding="utf-8") as file:
-        return json.load(file)
+# The course files are parsed once per process by catalog.py; everything
+# here reads from that shared, type-tagged snapshot. Returned courses,
+# policies and study plan are read-only mappings.
+from catalog import get_catalog
 
 # Load policies and study plan
 def load_policies():
-    return load_json(os.path.join(DATA_DIR, "Policies.json"))
+    return get_catalog().policies
 
 def load_study_plan():
-    return load_json(os.path.join(DATA_DIR, "StudyPlan.json"))
+    return get_catalog().study_plan
 
 # Load course groups
+def _courses_of_type(course_type):
+    catalog = get_catalog()
+    return [catalog.courses[code] for code in catalog.courses_by_type.get(course_type, ())]
+
 def load_core_courses():
-    return load_json(os.path.join(COURSES_DIR, "Core_courses.json"))
+    return _courses_of_type("core")
 
 def load_ft_courses():
-    return load_json(os.path.join(COURSES_DIR, "FT_courses.json"))
+    return _courses_of_type("field_training")
 
 def load_graduation_courses():
-    return load_json(os.path.join(COURSES_DIR, "Graduation_courses.json"))
+    return _courses_of_type("graduation")
 
 def load_elective_courses():
-    return load_json(os.path.join(ELECTIVES_DIR, "Elective_courses.json"))
+    return _courses_of_type("elective")
 
 def load_university_compulsory():
-    return load_json(os.path.join(UNIREQ_DIR, "Compulsory_unireq.json"))
+    return _courses_of_type("university_compulsory")
 
 def load_university_elective():
-    return load_json(os.path.join(UNIREQ_DIR, "Elective_unireq.json"))
+    return _courses_of_type("university_elective")
 
 def load_zero_credit_unireq():
-    return load_json(os.path.join(UNIREQ_DIR, "Zero_unireq.json"))
+    return _courses_of_type("zero_credit")
 
-# Merge all courses into a single dictionary
+# All courses in a single dictionary, keyed by code
 def get_all_courses():
-    all_courses = {}
-
-    # Core
-    for course in load_core_courses():
-        all_courses[course["code"]] = course
-
-    # Field Training
-    for course in load_ft_courses():
-        all_courses[course["code"]] = course
-
-    # Graduation Project
-    for course in load_graduation_courses():
-        all_courses[course["code"]] = course
-
-    # Electives
-    for course in load_elective_courses():
-        all_courses[course["code"]] = course
-
-    # University Compulsory
-    for course in load_university_compulsory():
-        all_courses[course["code"]] = course
-
-    # University Electives
-    for course in load_university_elective():
-        all_courses[course["code"]] = course
-
-    # Zero Credit Courses
-    for course in load_zero_credit_unireq():
-        all_courses[course["code"]] = course
-
-    return all_courses
+    return dict(get_catalog().courses)
\ No newline at end of file
@@ -3,17 +3,18 @@
 import json
 import os
 
-DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'Courses')
+from catalog import (COURSES_DIR, ELECTIVES_DIR, UNIREQ_DIR, SNAPSHOT_PATH,
+                     compile_snapshot, get_catalog, invalidate_catalog)
 
-# File paths
+# File paths (the same files the catalog loads)
 PATHS = {
-    "core": os.path.join(DATA_DIR, "Core_courses.json"),
-    "ft": os.path.join(DATA_DIR, "FT_courses.json"),
-    "graduation": os.path.join(DATA_DIR, "Graduation_courses.json"),
-    "elective": os.path.join(DATA_DIR, "Electives", "Elective_courses.json"),
-    "uni_compulsory": os.path.join(DATA_DIR, "UniReq", "Compulsory_unireq.json"),
-    "uni_elective": os.path.join(DATA_DIR, "UniReq", "Elective_unireq.json"),
-    "zero_unireq": os.path.join(DATA_DIR, "UniReq", "Zero_unireq.json")
+    "core": os.path.join(COURSES_DIR, "Core_courses.json"),
+    "ft": os.path.join(COURSES_DIR, "FT_courses.json"),
+    "graduation": os.path.join(COURSES_DIR, "Graduation_courses.json"),
+    "elective": os.path.join(ELECTIVES_DIR, "Elective_courses.json"),
+    "uni_compulsory": os.path.join(UNIREQ_DIR, "Compulsory_unireq.json"),
+    "uni_elective": os.path.join(UNIREQ_DIR, "Elective_unireq.json"),
+    "zero_unireq": os.path.join(UNIREQ_DIR, "Zero_unireq.json")
 }
 
 def load_json(path):
@@ -23,6 +24,11 @@ def load_json(path):
 def save_json(path, data):
     with open(path, "w", encoding="utf-8") as file:
         json.dump(data, file, indent=2, ensure_ascii=False)
+    # Keep a compiled snapshot in step with the sources
+    if os.path.exists(SNAPSHOT_PATH):
+        compile_snapshot()
+    # Make sure this process sees the edit even if the file stamp is unchanged
+    invalidate_catalog()
     print("✅ File saved.")
 
 def list_courses(course_type):
@@ -41,6 +47,9 @@ def list_courses(course_type):
 def add_course(course_type):
     print("\n📝 Enter New Course Info")
     code = input("Course Code: ").strip()
+    if code in get_catalog().courses:
+        print(f"❌ Course {code} already exists.")
+        return
     name = input("Course Name: ").strip()
     credits = int(input("Credit Hours: ").strip())
     semester = input("Semester Offered (comma-separated, e.g., Fall,Spring,Both): ").strip().split(",")
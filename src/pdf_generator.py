@@ -1,31 +1,139 @@
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
+# reportlab is imported inside PDFGenerator, so the app and the report
+# queue can import this module without loading it; reports are rendered
+# in worker processes
+import hashlib
+import io
+import json
+import multiprocessing
 import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+
+# Rendered reports the shared queue keeps in memory
+REPORT_CACHE_SIZE = 64
+
+
+def report_key(student_info, recommendations, explanations):
+    """Content hash of everything that ends up in a report"""
+    payload = json.dumps([student_info, recommendations, explanations],
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def safe_report_name(student_id):
+    """Student id with anything unsafe in a file name replaced"""
+    return re.sub(r"[^A-Za-z0-9_-]", "_", str(student_id))
+
 
 class PDFGenerator:
-    def __init__(self):
-        self.output_dir = "reports"
-        if not os.path.exists(self.output_dir):
+    def __init__(self, output_dir="reports"):
+        # output_dir=None for a generator that only renders in memory
+        self.output_dir = output_dir
+        if self.output_dir and not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
 
-    def generate_report(self, student_info, recommendations, explanations):
-        filename = f"{self.output_dir}/{student_info['student_id']}_report.pdf"
-        doc = SimpleDocTemplate(filename, pagesize=letter)
-        styles = getSampleStyleSheet()
-        story = []
+        from reportlab.lib import colors
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 
-        # Title
-        title_style = ParagraphStyle(
+        # Styles are built once per generator rather than once per report
+        self.styles = getSampleStyleSheet()
+        self.title_style = ParagraphStyle(
             'CustomTitle',
-            parent=styles['Heading1'],
+            parent=self.styles['Heading1'],
             fontSize=24,
             spaceAfter=30,
             alignment=1  # Center alignment
         )
-        story.append(Paragraph("AIU Course Registration Report", title_style))
+        self.total_style = ParagraphStyle(
+            'TotalStyle',
+            parent=self.styles['Normal'],
+            fontSize=12,
+            spaceAfter=20,
+            textColor=colors.darkblue
+        )
+        self.explanation_style = ParagraphStyle(
+            'ExplanationStyle',
+            parent=self.styles['Normal'],
+            fontSize=10,
+            spaceAfter=10,
+            leftIndent=20
+        )
+        self.footer_style = ParagraphStyle(
+            'FooterStyle',
+            parent=self.styles['Normal'],
+            fontSize=8,
+            textColor=colors.grey,
+            alignment=1  # Center alignment
+        )
+        # Shared look of both tables in the report
+        self.table_style = [
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('PADDING', (0, 0), (-1, -1), 6)
+        ]
+
+    def report_path(self, student_info, key):
+        """Content-addressed file name, so identical reports share one file"""
+        safe_id = safe_report_name(student_info['student_id'])
+        return os.path.join(self.output_dir, f"{safe_id}_{key[:16]}_report.pdf")
+
+    def render_report(self, student_info, recommendations, explanations):
+        """Render the report in memory and return the PDF bytes"""
+        from reportlab.lib.pagesizes import letter
+        from reportlab.platypus import SimpleDocTemplate
+
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=letter)
+        doc.build(self._build_story(student_info, recommendations, explanations))
+        return buffer.getvalue()
+
+    def render_merged(self, reports):
+        """One PDF holding every (student_info, recommendations, explanations)
+        report, each starting on a new page"""
+        from reportlab.lib.pagesizes import letter
+        from reportlab.platypus import PageBreak, SimpleDocTemplate
+
+        story = []
+        for student_info, recommendations, explanations in reports:
+            if story:
+                story.append(PageBreak())
+            story.extend(self._build_story(student_info, recommendations, explanations))
+        buffer = io.BytesIO()
+        SimpleDocTemplate(buffer, pagesize=letter).build(story)
+        return buffer.getvalue()
+
+    def generate_report(self, student_info, recommendations, explanations):
+        """Write the report under output_dir and return its path"""
+        key = report_key(student_info, recommendations, explanations)
+        filename = self.report_path(student_info, key)
+        if os.path.exists(filename):
+            return filename
+
+        # Write to a temp file first so a half-written PDF is never served
+        data = self.render_report(student_info, recommendations, explanations)
+        temp_name = f"{filename}.{os.getpid()}.tmp"
+        with open(temp_name, "wb") as f:
+            f.write(data)
+        os.replace(temp_name, filename)
+        return filename
+
+    def _build_story(self, student_info, recommendations, explanations):
+        from reportlab.lib import colors
+        from reportlab.lib.units import inch
+        from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
+
+        styles = self.styles
+        story = []
+
+        # Title
+        story.append(Paragraph("AIU Course Registration Report", self.title_style))
         story.append(Spacer(1, 20))
 
         # Student Information
@@ -38,17 +146,9 @@ class PDFGenerator:
             ["Date", student_info['registration_date']]
         ]
         student_table = Table(student_data, colWidths=[2*inch, 4*inch])
-        student_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('PADDING', (0, 0), (-1, -1), 6)
-        ]))
+        student_table.setStyle(TableStyle(
+            [('BACKGROUND', (0, 0), (0, -1), colors.lightgrey)] + self.table_style
+        ))
         story.append(student_table)
         story.append(Spacer(1, 20))
 
@@ -60,57 +160,138 @@ class PDFGenerator:
                 for r in recommendations
             ]
             course_table = Table(course_data, colWidths=[2*inch, 3*inch, 1*inch])
-            course_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('PADDING', (0, 0), (-1, -1), 6)
-            ]))
+            course_table.setStyle(TableStyle(
+                [('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey)] + self.table_style
+            ))
             story.append(course_table)
             story.append(Spacer(1, 20))
 
             # Total Credits
             total_credits = sum(r["Credits"] for r in recommendations)
-            total_style = ParagraphStyle(
-                'TotalStyle',
-                parent=styles['Normal'],
-                fontSize=12,
-                spaceAfter=20,
-                textColor=colors.darkblue
-            )
-            story.append(Paragraph(f"Total Credit Hours: {total_credits}", total_style))
+            story.append(Paragraph(f"Total Credit Hours: {total_credits}", self.total_style))
             story.append(Spacer(1, 20))
 
         # Explanations
         story.append(Paragraph("Recommendation Explanations", styles['Heading2']))
         for explanation in explanations:
-            exp_style = ParagraphStyle(
-                'ExplanationStyle',
-                parent=styles['Normal'],
-                fontSize=10,
-                spaceAfter=10,
-                leftIndent=20
-            )
-            story.append(Paragraph(explanation, exp_style))
+            story.append(Paragraph(explanation, self.explanation_style))
             story.append(Spacer(1, 5))
 
         # Footer
-        footer_style = ParagraphStyle(
-            'FooterStyle',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.grey,
-            alignment=1  # Center alignment
-        )
         story.append(Spacer(1, 30))
-        story.append(Paragraph("AIU CSE Course Registration System", footer_style))
-        story.append(Paragraph("Generated on: " + student_info['registration_date'], footer_style))
+        story.append(Paragraph("AIU CSE Course Registration System", self.footer_style))
+        story.append(Paragraph("Generated on: " + student_info['registration_date'], self.footer_style))
+        return story
+
+
+# One generator (and so one set of styles) per worker process
+_worker_generator = None
+
+
+def _init_worker():
+    global _worker_generator
+    _worker_generator = PDFGenerator(output_dir=None)
+
+
+def _render_in_worker(student_info, recommendations, explanations):
+    return _worker_generator.render_report(student_info, recommendations, explanations)
+
+
+class ReportJob:
+    """Handle to a report being rendered in the background"""
+
+    def __init__(self, key, future):
+        self.key = key
+        self.future = future
+
+    def done(self):
+        return self.future.done()
+
+    @property
+    def status(self):
+        if not self.future.done():
+            return "pending"
+        return "failed" if self.future.exception() is not None else "done"
+
+    def result(self, timeout=None):
+        """Bytes of the finished PDF (waits up to timeout seconds)"""
+        return self.future.result(timeout)
+
+
+class ReportQueue:
+    """Renders reports on a process pool and caches them by content hash.
+
+    submit() returns at once with a ReportJob whose result is the PDF bytes.
+    Reports are rendered in memory, so sessions never share or overwrite a
+    file. Recently rendered reports resolve immediately from the cache, and
+    an identical report that is still rendering shares the in-flight job.
+    """
+
+    def __init__(self, workers=2, cache_size=REPORT_CACHE_SIZE):
+        self.workers = workers
+        self.cache_size = cache_size
+        self._executor = None
+        self._jobs = {}
+        self._reports = OrderedDict()
+        # Re-entrant: a job that finishes at once runs its callback inline
+        self._lock = threading.RLock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            # spawn: forking a multi-threaded server process is not safe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+        return self._executor
+
+    def submit(self, student_info, recommendations, explanations):
+        key = report_key(student_info, recommendations, explanations)
+
+        with self._lock:
+            if key in self._reports:
+                self._reports.move_to_end(key)
+                future = Future()
+                future.set_result(self._reports[key])
+                return ReportJob(key, future)
+
+            job = self._jobs.get(key)
+            if job is not None and job.status != "failed":
+                return job
+
+            future = self._get_executor().submit(
+                _render_in_worker, student_info, recommendations, explanations
+            )
+            job = ReportJob(key, future)
+            self._jobs[key] = job
+            future.add_done_callback(lambda done: self._finish(key, done))
+            return job
+
+    def _finish(self, key, future):
+        with self._lock:
+            self._jobs.pop(key, None)
+            if future.cancelled() or future.exception() is not None:
+                return
+            self._reports[key] = future.result()
+            while len(self._reports) > self.cache_size:
+                self._reports.popitem(last=False)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+_report_queue = None
+_report_queue_lock = threading.Lock()
+
 
-        # Build PDF
-        doc.build(story)
-        return filename 
\ No newline at end of file
+def get_report_queue():
+    """Process-wide report queue shared by every session"""
+    global _report_queue
+    with _report_queue_lock:
+        if _report_queue is None:
+            _report_queue = ReportQueue()
+        return _report_queue
\ No newline at end of file
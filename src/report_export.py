@@ -0,0 +1,142 @@
+# src/report_export.py
+
+import argparse
+import sys
+import zipfile
+from datetime import datetime
+from itertools import islice
+from multiprocessing import get_context
+
+from batch_advising import read_student_records
+from pdf_generator import PDFGenerator, _init_worker, _render_in_worker, safe_report_name
+from student_store import open_store
+
+
+def report_entries(results, store=None):
+    """Turn batch advising results into (student_info, recommendations,
+    explanations) entries, skipping rows that failed or have no advice.
+
+    Name, email and level come from the student store when the student
+    is registered; the report is dated at export time.
+    """
+    generated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    for result in results:
+        if "error" in result or "recommendations" not in result:
+            continue
+        student_id = str(result.get("student_id", ""))
+        stored = store.get(student_id) if store is not None else None
+        student_info = {
+            "student_id": student_id,
+            "name": "",
+            "email": "",
+            "level": ""
+        }
+        if stored:
+            student_info.update((field, stored[field]) for field in ("name", "email", "level")
+                                if stored.get(field) is not None)
+        student_info["registration_date"] = generated
+        yield student_info, result["recommendations"], result["explanations"]
+
+
+def _render_entry(entry):
+    student_info, recommendations, explanations = entry
+    data = _render_in_worker(student_info, recommendations, explanations)
+    return student_info["student_id"], data
+
+
+def render_reports(entries, workers=None, chunksize=8):
+    """Render entries to PDF bytes, yielding (student_id, data) in input order.
+
+    Like advise_batch, entries are consumed in bounded windows so only a
+    few reports are held in memory at once. workers=1 renders in this
+    process.
+    """
+    entries = iter(entries)
+    if workers == 1:
+        _init_worker()
+        for entry in entries:
+            yield _render_entry(entry)
+        return
+
+    workers = workers or 2
+    window = workers * chunksize * 4
+    # spawn, as for the app's report queue
+    with get_context("spawn").Pool(workers, initializer=_init_worker) as pool:
+        while True:
+            batch = list(islice(entries, window))
+            if not batch:
+                break
+            for rendered in pool.imap(_render_entry, batch, chunksize):
+                yield rendered
+
+
+def export_zip(entries, output, workers=None, chunksize=8):
+    """Stream one PDF per entry into a ZIP archive; returns the report count.
+
+    output may be a path or a binary file object (including an unseekable
+    one such as stdout).
+    """
+    count = 0
+    names = set()
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for student_id, data in render_reports(entries, workers, chunksize):
+            base = safe_report_name(student_id) or "student"
+            name = f"{base}_report.pdf"
+            suffix = 1
+            while name in names:
+                suffix += 1
+                name = f"{base}_{suffix}_report.pdf"
+            names.add(name)
+            archive.writestr(name, data)
+            count += 1
+    return count
+
+
+def export_merged(entries, output):
+    """Write every entry into a single PDF; returns the report count.
+
+    ReportLab cannot append finished PDFs, so the merged document is laid
+    out in one pass in this process.
+    """
+    entries = list(entries)
+    data = PDFGenerator(output_dir=None).render_merged(entries)
+    if hasattr(output, "write"):
+        output.write(data)
+    else:
+        with open(output, "wb") as f:
+            f.write(data)
+    return len(entries)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render PDF reports for a cohort advised by batch_advising.py."
+    )
+    parser.add_argument("input", help="JSONL results written by batch_advising.py")
+    parser.add_argument("-o", "--output", default="reports.zip",
+                        help="ZIP (or, with --merge, PDF) file to write; - for stdout")
+    parser.add_argument("--merge", action="store_true",
+                        help="Write one merged PDF instead of a ZIP of reports")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Worker processes for ZIP export (default: 2, 1 = no pool)")
+    parser.add_argument("--chunksize", type=int, default=8,
+                        help="Reports sent to a worker at a time")
+    args = parser.parse_args(argv)
+
+    store = open_store()
+    try:
+        entries = report_entries(read_student_records(args.input), store)
+        output = sys.stdout.buffer if args.output == "-" else args.output
+        if args.merge:
+            count = export_merged(entries, output)
+        else:
+            count = export_zip(entries, output, args.workers, args.chunksize)
+    finally:
+        store.close()
+
+    print(f"✅ Exported {count} reports.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,409 @@
+# src/student_store.py
+
+import argparse
+import atexit
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from catalog import DATA_DIR
+
+STUDENT_FIELDS = ("student_id", "name", "email", "level", "registration_date")
+
+DEFAULT_JSON_PATH = os.path.join(DATA_DIR, "students.json")
+DEFAULT_SQLITE_PATH = os.path.join(DATA_DIR, "students.db")
+
+
+@contextmanager
+def _locked(path, exclusive=True):
+    """Hold an inter-process lock on path for the duration of the block"""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        else:
+            # msvcrt only has exclusive locks; LK_LOCK retries for ~10 s
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class JsonStudentStore:
+    """Students kept in a JSON list on disk with an in-memory id index.
+
+    The file is parsed once and re-read only when its mtime changes, so
+    lookups are dictionary hits instead of a scan of the whole list.
+    """
+
+    def __init__(self, path=DEFAULT_JSON_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._index = {}
+        self._stamp = None
+        if not os.path.exists(self.path):
+            self._write([])
+
+    def _file_stamp(self):
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size
+
+    def _refresh(self):
+        """Rebuild the index if the file changed since it was last read"""
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            students = json.load(f)
+        self._index = {s["student_id"]: s for s in students}
+        self._stamp = stamp
+
+    def _write(self, students):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(students, f, indent=2)
+
+    def get(self, student_id):
+        with self._lock:
+            self._refresh()
+            student = self._index.get(student_id)
+            return dict(student) if student is not None else None
+
+    def add(self, student):
+        """Store a new student; returns False if the id is already taken"""
+        with self._lock:
+            self._refresh()
+            if student["student_id"] in self._index:
+                return False
+            self._index[student["student_id"]] = dict(student)
+            self._write(list(self._index.values()))
+            self._stamp = self._file_stamp()
+            return True
+
+    def all(self):
+        with self._lock:
+            self._refresh()
+            return [dict(s) for s in self._index.values()]
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return len(self._index)
+
+    def close(self):
+        """Nothing to release; present so every store can be closed alike"""
+
+
+class SqliteStudentStore:
+    """Students kept in an SQLite table keyed on student_id"""
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS students ("
+                " student_id TEXT PRIMARY KEY,"
+                " name TEXT, email TEXT, level TEXT, registration_date TEXT)"
+            )
+
+    def get(self, student_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM students WHERE student_id = ?", (student_id,)
+            ).fetchone()
+        return dict(row) if row is not None else None
+
+    def add(self, student):
+        """Store a new student; returns False if the id is already taken"""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT INTO students VALUES (?, ?, ?, ?, ?)",
+                    tuple(student.get(field) for field in STUDENT_FIELDS)
+                )
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def add_many(self, students):
+        """Bulk insert, skipping ids that already exist; returns rows added"""
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO students VALUES (?, ?, ?, ?, ?)",
+                (tuple(s.get(field) for field in STUDENT_FIELDS) for s in students)
+            )
+            return self._conn.total_changes - before
+
+    def all(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM students ORDER BY rowid").fetchall()
+        return [dict(row) for row in rows]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM students").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class JournalStudentStore:
+    """Students kept as a JSON snapshot plus an append-only JSONL journal.
+
+    A registration is one locked append to the journal, so concurrent
+    writers (several Streamlit sessions or processes) never overwrite each
+    other. fsync is batched: the journal is synced once fsync_batch
+    appends are pending or fsync_interval seconds have passed, and on
+    close. After compact_every journal entries the journal is folded into
+    the snapshot (written to a temp file and atomically renamed) and
+    truncated. The in-memory index is rebuilt from snapshot + journal on
+    startup and caught up from the journal tail on every call, so
+    registrations from other processes are seen too. A torn last line
+    left by a crash is skipped.
+
+    The snapshot uses the same format as students.json, so existing data
+    files work unchanged.
+    """
+
+    def __init__(self, snapshot_path=DEFAULT_JSON_PATH, journal_path=None,
+                 fsync_batch=32, fsync_interval=0.5, compact_every=1000):
+        self.snapshot_path = snapshot_path
+        # students.json -> students.journal.jsonl next to it
+        self.journal_path = journal_path or os.path.splitext(snapshot_path)[0] + ".journal.jsonl"
+        self.lock_path = self.journal_path + ".lock"
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+        self.compact_every = compact_every
+
+        self._lock = threading.Lock()
+        self._index = {}
+        self._snapshot_stamp = None
+        self._journal_offset = 0
+        self._journal_entries = 0
+        self._pending_sync = 0
+        self._last_sync = time.monotonic()
+
+        with _locked(self.lock_path):
+            if not os.path.exists(self.snapshot_path):
+                self._write_snapshot([])
+        self._journal = open(self.journal_path, "ab")
+        with self._lock:
+            self._catch_up()
+        atexit.register(self.close)
+
+    def _stamp(self, path):
+        st = os.stat(path)
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _write_snapshot(self, students):
+        temp_path = self.snapshot_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(students, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.snapshot_path)
+
+    def _rebuild(self):
+        """Load the snapshot and replay the whole journal"""
+        with open(self.snapshot_path, "r", encoding="utf-8") as f:
+            students = json.load(f)
+        self._snapshot_stamp = self._stamp(self.snapshot_path)
+        self._index = {s["student_id"]: s for s in students}
+        self._journal_offset = 0
+        self._journal_entries = 0
+        self._read_journal_tail()
+
+    def _read_journal_tail(self):
+        """Apply complete journal lines written since the last read"""
+        with open(self.journal_path, "rb") as f:
+            f.seek(self._journal_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # still being written, or torn by a crash
+                self._journal_offset += len(line)
+                try:
+                    student = json.loads(line)
+                except ValueError:
+                    continue
+                self._index.setdefault(student["student_id"], student)
+                self._journal_entries += 1
+
+    def _catch_up(self, holding_lock=False):
+        """Bring the index up to date with what other writers did"""
+        journal_size = os.path.getsize(self.journal_path)
+        if (self._snapshot_stamp != self._stamp(self.snapshot_path)
+                or journal_size < self._journal_offset):
+            # Someone compacted since we last looked
+            if holding_lock:
+                self._rebuild()
+            else:
+                with _locked(self.lock_path, exclusive=False):
+                    self._rebuild()
+        elif journal_size > self._journal_offset:
+            self._read_journal_tail()
+
+    def _sync(self, force=False):
+        if not self._pending_sync:
+            return
+        if (force or self._pending_sync >= self.fsync_batch
+                or time.monotonic() - self._last_sync >= self.fsync_interval):
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self._pending_sync = 0
+            self._last_sync = time.monotonic()
+
+    def _compact(self):
+        """Fold the journal into the snapshot; caller holds the file lock"""
+        self._sync(force=True)
+        self._write_snapshot(list(self._index.values()))
+        self._journal.truncate(0)
+        os.fsync(self._journal.fileno())
+        self._snapshot_stamp = self._stamp(self.snapshot_path)
+        self._journal_offset = 0
+        self._journal_entries = 0
+
+    def get(self, student_id):
+        with self._lock:
+            self._catch_up()
+            student = self._index.get(student_id)
+            return dict(student) if student is not None else None
+
+    def add(self, student):
+        """Append a new student; returns False if the id is already taken"""
+        with self._lock, _locked(self.lock_path):
+            self._catch_up(holding_lock=True)
+            if student["student_id"] in self._index:
+                return False
+
+            # A crash may have left a partial last line; start a fresh one
+            journal_size = os.path.getsize(self.journal_path)
+            prefix = b"\n" if journal_size > self._journal_offset else b""
+            self._journal.write(prefix + json.dumps(student).encode("utf-8") + b"\n")
+            self._journal.flush()
+            self._pending_sync += 1
+            self._sync()
+
+            self._index[student["student_id"]] = dict(student)
+            self._journal_offset = os.path.getsize(self.journal_path)
+            self._journal_entries += 1
+            if self._journal_entries >= self.compact_every:
+                self._compact()
+            return True
+
+    def compact(self):
+        """Fold the journal into the snapshot now"""
+        with self._lock, _locked(self.lock_path):
+            self._catch_up(holding_lock=True)
+            self._compact()
+
+    def all(self):
+        with self._lock:
+            self._catch_up()
+            return [dict(s) for s in self._index.values()]
+
+    def __len__(self):
+        with self._lock:
+            self._catch_up()
+            return len(self._index)
+
+    def close(self):
+        with self._lock:
+            if self._journal.closed:
+                return
+            self._sync(force=True)
+            self._journal.close()
+
+
+def _fold_journal(json_path):
+    """Compact journaled registrations into json_path so the plain JSON
+    store, which never reads the journal, does not lose them"""
+    journal_path = os.path.splitext(json_path)[0] + ".journal.jsonl"
+    if os.path.exists(journal_path) and os.path.getsize(journal_path) > 0:
+        journal = JournalStudentStore(json_path)
+        try:
+            journal.compact()
+        finally:
+            journal.close()
+
+
+def open_store(backend=None, path=None):
+    """Open the configured student store.
+
+    The backend defaults to the STUDENT_STORE environment variable
+    ("journal", "json" or "sqlite"), falling back to the journal store.
+    """
+    backend = (backend or os.environ.get("STUDENT_STORE") or "journal").lower()
+    if backend == "journal":
+        return JournalStudentStore(path or DEFAULT_JSON_PATH)
+    if backend == "json":
+        path = path or DEFAULT_JSON_PATH
+        _fold_journal(path)
+        return JsonStudentStore(path)
+    if backend == "sqlite":
+        return SqliteStudentStore(path or DEFAULT_SQLITE_PATH)
+    raise ValueError(f"Unknown student store backend: {backend}")
+
+
+def migrate_json_to_sqlite(json_path=DEFAULT_JSON_PATH, sqlite_path=DEFAULT_SQLITE_PATH):
+    """Copy every student from the JSON file into SQLite; returns (read, added)
+
+    Registrations still sitting in the journal next to the JSON file are
+    included.
+    """
+    journal = JournalStudentStore(json_path)
+    try:
+        students = journal.all()
+    finally:
+        journal.close()
+    store = SqliteStudentStore(sqlite_path)
+    try:
+        added = store.add_many(students)
+    finally:
+        store.close()
+    return len(students), added
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Student store maintenance.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    migrate = sub.add_parser("migrate", help="Copy students.json into SQLite")
+    migrate.add_argument("--json", default=DEFAULT_JSON_PATH)
+    migrate.add_argument("--sqlite", default=DEFAULT_SQLITE_PATH)
+    compact = sub.add_parser("compact", help="Fold the registration journal into students.json")
+    compact.add_argument("--json", default=DEFAULT_JSON_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "migrate":
+        read, added = migrate_json_to_sqlite(args.json, args.sqlite)
+        print(f"✅ Migrated {added} of {read} students into {args.sqlite}.")
+    elif args.command == "compact":
+        store = JournalStudentStore(args.json)
+        store.compact()
+        count = len(store)
+        store.close()
+        print(f"✅ Compacted {count} students into {args.json}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
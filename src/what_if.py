@@ -0,0 +1,219 @@
+# src/what_if.py
+
+import copy
+import heapq
+import threading
+
+from advising import SELECTION_MODES, AdvisingPipeline, recommendation_row
+from instrumentation import finish_trace, start_trace
+
+# Changes a variant may make to the base profile
+VARIANT_KEYS = ("name", "pass", "fail", "drop", "cgpa", "semester")
+
+# Base course orders of one catalog snapshot, by (semester, level); see _base_order
+_base_orders = {}
+_base_orders_catalog = None
+_base_orders_lock = threading.Lock()
+
+
+def apply_variant(cgpa, passed, failed, semester, variant):
+    """The (cgpa, passed, failed, semester) a variant describes.
+
+    "pass" and "fail" move courses into the passed or failed list (out of
+    the other one), "drop" removes them from both, and "cgpa" / "semester"
+    replace the base values.
+    """
+    unknown = set(variant) - set(VARIANT_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown what-if change: {', '.join(sorted(unknown))}")
+
+    passed = set(passed)
+    failed = set(failed)
+    for code in variant.get("pass", ()):
+        passed.add(code)
+        failed.discard(code)
+    for code in variant.get("fail", ()):
+        failed.add(code)
+        passed.discard(code)
+    for code in variant.get("drop", ()):
+        passed.discard(code)
+        failed.discard(code)
+    return (variant.get("cgpa", cgpa), sorted(passed), sorted(failed),
+            variant.get("semester", semester))
+
+
+def _summary(recommendations, explanations, credit_limit):
+    return {
+        "recommendations": recommendations,
+        "explanations": explanations,
+        "credit_limit": credit_limit,
+        "total_credits": sum(r["Credits"] for r in recommendations)
+    }
+
+
+def _base_order(pipeline, catalog, context):
+    """Courses offered in the context's semester, ranked as if none were failed.
+
+    Returns (courses, priorities): the ranked courses and their priority
+    by code. The order depends only on the
+    semester and the student's level, so it is computed once per catalog
+    snapshot and shared by every sweep.
+    """
+    global _base_orders_catalog
+    key = (context.semester, context.current_level)
+    with _base_orders_lock:
+        if _base_orders_catalog is not catalog:
+            _base_orders.clear()
+            _base_orders_catalog = catalog
+        if key not in _base_orders:
+            _base_orders[key] = _rank_unfailed(pipeline, catalog, context)
+        return _base_orders[key]
+
+
+def _rank_unfailed(pipeline, catalog, context):
+    unfailed = copy.copy(context)
+    unfailed.failed = frozenset()
+    available = pipeline._get_available_courses(catalog.courses, context.semester)
+    priorities = pipeline._get_course_priorities(available, unfailed)
+    order = sorted(range(len(available)), key=priorities.__getitem__, reverse=True)
+    return [available[i] for i in order], {available[i].code: priorities[i] for i in order}
+
+
+def _rank(pipeline, base, context):
+    """The scenario's eligible courses in priority order, from a base order.
+
+    Same list as _filter_eligible_courses + _sort_courses_by_priority: the
+    eligible courses keep their base order, except failed ones, which are
+    re-scored and merged back in (ties still go to catalog order).
+    """
+    courses, priorities = base
+    ids = pipeline._get_catalog().course_ids
+
+    def key(entry):
+        # Scalar sort order: priority, then catalog order on ties
+        return -entry[0], ids[entry[1].code]
+
+    eligible = pipeline._filter_eligible_courses(courses, context)
+    failed = [course for course in eligible if course.code in context.failed]
+    if not failed:
+        return eligible
+
+    rescored = pipeline._get_course_priorities(failed, context)
+    bumped = sorted(zip(rescored, failed), key=key)
+    kept = [(priorities[course.code], course) for course in eligible
+            if course.code not in context.failed]
+    merged = heapq.merge(bumped, kept, key=key)
+    return [course for _, course in merged]
+
+
+def sweep(cgpa, passed, failed, semester, variants, selection="greedy", catalog=None):
+    """Advise a base profile and every variant of it, diffed against the base.
+
+    Work is shared across scenarios. Course priorities are computed once
+    per semester and level (and kept for later sweeps while the catalog
+    stays the same); each distinct passed/failed/semester
+    combination then only filters that order and re-scores its failed
+    courses. Course selection is redone per credit limit, so a CGPA in
+    another Policies.json band costs one selection, and explanations are
+    shared by every scenario that would word them the same way.
+
+    Each variant's recommendations and explanations are exactly what
+    advise_student returns for the same inputs. Returns a dict with the
+    "baseline" and one "variants" entry per variant, in order, each with
+    the courses "added" and "removed" relative to the baseline and the
+    "credit_change". catalog defaults to the shared, current one.
+    """
+    if selection not in SELECTION_MODES:
+        raise ValueError(f"Unknown selection mode: {selection}")
+
+    trace = start_trace("what_if")
+    try:
+        pipeline = AdvisingPipeline()
+        pipeline._trace = trace
+        pipeline.catalog = catalog
+        catalog = pipeline._pin_catalog()
+
+        with trace.stage("load"):
+            scenarios = [(cgpa, list(passed), list(failed), semester)]
+            scenarios += [apply_variant(cgpa, passed, failed, semester, v) for v in variants]
+
+            groups = {}
+            scenario_groups = []
+            for _, s_passed, s_failed, s_semester in scenarios:
+                key = (frozenset(s_passed), frozenset(s_failed), s_semester)
+                scenario_groups.append(groups.setdefault(key, len(groups)))
+
+        # Everything below is keyed by group, so each distinct student state
+        # builds one context and is ranked once
+        contexts = {}
+        ranked = {}
+        rows = {}
+        explained = {}
+        solved = {}
+        results = []
+        for (s_cgpa, s_passed, s_failed, s_semester), group in zip(scenarios, scenario_groups):
+            credit_limit = pipeline._get_credit_limit(s_cgpa, catalog.policies)
+            key = (group, credit_limit)
+            if key not in solved:
+                context = contexts.get(group)
+                if context is None:
+                    context = contexts[group] = pipeline._build_student_context(
+                        s_cgpa, s_passed, s_failed, s_semester
+                    )
+                    with trace.stage("rank"):
+                        ranked[group] = _rank(pipeline, _base_order(pipeline, catalog, context), context)
+                if context.credit_limit != credit_limit:
+                    # Only the CGPA band differs from the group's context
+                    context = copy.copy(context)
+                    context.cgpa = s_cgpa
+                    context.credit_limit = credit_limit
+
+                with trace.stage("select"):
+                    if selection == "optimal":
+                        selected = pipeline._select_courses_optimal(ranked[group], context)
+                    else:
+                        selected = pipeline._select_courses_within_limit(ranked[group], credit_limit)
+
+                with trace.stage("explain"):
+                    # An explanation depends on the course, whether it was
+                    # failed, the semester and the student's level
+                    wording = (context.semester, context.current_level)
+                    texts = []
+                    for course in selected:
+                        if course.code not in rows:
+                            rows[course.code] = recommendation_row(course, catalog)
+                        text_key = (course.code, course.code in context.failed) + wording
+                        if text_key not in explained:
+                            explained[text_key] = pipeline._generate_explanations(
+                                [course], context
+                            )[0]
+                        texts.append(explained[text_key])
+                    solved[key] = _summary(
+                        [rows[course.code] for course in selected], texts, credit_limit
+                    )
+            result = solved[key]
+            results.append(dict(result, recommendations=[dict(r) for r in result["recommendations"]],
+                                explanations=list(result["explanations"])))
+
+        trace.note(variants=len(variants), rankings=len(groups), selections=len(solved))
+
+        baseline = results[0]
+        base_codes = [r["Course Code"] for r in baseline["recommendations"]]
+        report = []
+        for variant, scenario, result in zip(variants, scenarios[1:], results[1:]):
+            codes = [r["Course Code"] for r in result["recommendations"]]
+            s_cgpa, s_passed, s_failed, s_semester = scenario
+            report.append(dict(
+                result,
+                name=variant.get("name", ""),
+                cgpa=s_cgpa,
+                passed=s_passed,
+                failed=s_failed,
+                semester=s_semester,
+                added=[code for code in codes if code not in base_codes],
+                removed=[code for code in base_codes if code not in codes],
+                credit_change=result["total_credits"] - baseline["total_credits"]
+            ))
+        return {"baseline": baseline, "variants": report}
+    finally:
+        finish_trace(trace)
@@ -0,0 +1,71 @@
+# tests/test_advising_equivalence.py
+
+import random
+
+import pytest
+
+from advising import SELECTION_MODES, clear_cache
+from catalog import get_catalog
+from inference_engine import advise_student
+
+CORPUS_SIZE = 200
+
+
+def student_corpus(count, seed=0):
+    """Seeded student profiles consistent with the prerequisite graph"""
+    courses = get_catalog().courses
+    codes = sorted(courses)
+    rng = random.Random(seed)
+    profiles = []
+    for _ in range(count):
+        progress = rng.random()
+        passed = set()
+        # A few passes over the catalog so later courses can unlock
+        for _ in range(4):
+            for code in codes:
+                if code not in passed and rng.random() < progress and all(
+                        p in passed for p in courses[code].get("prerequisites", ())):
+                    passed.add(code)
+        not_passed = [code for code in codes if code not in passed]
+        failed = rng.sample(not_passed, min(len(not_passed), rng.choice((0, 0, 1, 2, 3))))
+        profiles.append((
+            round(rng.uniform(0.5, 4.0), 2),
+            sorted(passed),
+            sorted(failed),
+            rng.choice(("Fall", "Spring"))
+        ))
+    return profiles
+
+
+@pytest.mark.parametrize("selection", SELECTION_MODES)
+def test_direct_and_engine_paths_agree(selection):
+    clear_cache()
+    for profile in student_corpus(CORPUS_SIZE):
+        direct = advise_student(*profile, selection=selection)
+        engine = advise_student(*profile, use_engine=True, selection=selection)
+        assert direct[0] == engine[0], profile
+        assert direct[1] == engine[1], profile
+
+
+def test_cached_results_match_fresh_ones():
+    profiles = student_corpus(50, seed=1)
+    clear_cache()
+    fresh = [advise_student(*profile) for profile in profiles]
+    cached = [advise_student(*profile) for profile in profiles]
+    assert fresh == cached
+
+
+@pytest.mark.parametrize("profile, expected", [
+    ((3.5, [], [], "Fall"),
+     ["MAT111", "CSE014", "MAT131", "CSE315", "LAN011", "LAN112", "PSC101", "LAN021", "LAN022", "CSE011"]),
+    ((2.5, ["CSE014", "MAT111", "LAN011"], ["MAT131"], "Spring"),
+     ["MAT112", "CSE015", "PHY211", "LAN114", "LAN112", "GEO217", "LAN021", "LAN022", "CSE011"]),
+    ((1.5, ["CSE014", "MAT111"], [], "Fall"),
+     ["MAT131", "CSE315", "LAN011", "LAN112", "PSC101", "LAN021", "LAN022", "CSE011"]),
+])
+def test_golden_recommendations(profile, expected):
+    for use_engine in (False, True):
+        recommendations, explanations = advise_student(*profile, use_engine=use_engine)
+        assert [r["Course Code"] for r in recommendations] == expected
+        assert len(explanations) == len(expected)
+        assert all(e.startswith(f"Recommended {code} ") for e, code in zip(explanations, expected))
@@ -0,0 +1,60 @@
+# tests/test_advising_server.py
+
+import asyncio
+import json
+
+from advising_server import AdvisingServer
+
+STUDENT = {"student_id": "s1", "cgpa": 3.0, "passed": [], "failed": [], "semester": "Fall"}
+
+
+async def exchange(port, raw):
+    """Send raw request bytes; returns (status, JSON body)"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        writer.write(raw)
+        await writer.drain()
+        head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+        length = int(next(line.split(":", 1)[1] for line in head.split("\r\n")
+                          if line.lower().startswith("content-length:")))
+        return int(head.split(" ", 2)[1]), json.loads(await reader.readexactly(length))
+    finally:
+        writer.close()
+
+
+def post(path, payload):
+    body = json.dumps(payload).encode("utf-8")
+    return (f"POST {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n").encode("latin-1") + body
+
+
+def run_with_server(check):
+    async def main():
+        server = await AdvisingServer(port=0, workers=1).start()
+        try:
+            return await check(server.port)
+        finally:
+            await server.close()
+    return asyncio.run(main())
+
+
+def test_invalid_batch_students_get_error_entries():
+    async def check(port):
+        return await exchange(port, post("/advise/batch", {"students": [STUDENT, 1, "x"]}))
+
+    status, payload = run_with_server(check)
+    assert status == 200
+    good, number, text = payload["results"]
+    assert good["recommendations"]
+    assert number == {"student_id": "", "error": "Expected a JSON object, got int"}
+    assert text["error"] == "Expected a JSON object, got str"
+
+
+def test_negative_content_length_is_rejected():
+    async def check(port):
+        raw = b"POST /advise HTTP/1.1\r\nContent-Length: -5\r\n\r\n"
+        return await exchange(port, raw)
+
+    status, payload = run_with_server(check)
+    assert status == 400
+    assert payload == {"error": "Invalid Content-Length"}
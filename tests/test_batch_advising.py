@@ -0,0 +1,39 @@
+# tests/test_batch_advising.py
+
+import json
+
+from batch_advising import advise_batch, read_student_records
+
+GOOD = {"student_id": "s1", "cgpa": 3.0, "passed": [], "failed": [], "semester": "Fall"}
+
+
+def test_invalid_jsonl_lines_become_error_entries(tmp_path):
+    path = tmp_path / "students.jsonl"
+    lines = [
+        json.dumps(GOOD),
+        "{not json",
+        "[1, 2]",
+        json.dumps(dict(GOOD, student_id="s2", semester="")),
+        json.dumps(dict(GOOD, student_id="s3", semester="Winter")),
+        json.dumps(dict(GOOD, student_id="s4"))
+    ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    results = list(advise_batch(read_student_records(str(path)), workers=1))
+    assert [r["student_id"] for r in results] == ["s1", "", "", "s2", "s3", "s4"]
+    assert ["error" in r for r in results] == [False, True, True, True, True, False]
+    assert results[1]["error"].startswith("Line 2: JSONDecodeError")
+    assert results[2]["error"] == "Expected a JSON object, got list"
+    assert results[3]["error"] == "ValueError: semester is empty"
+    assert "Winter" in results[4]["error"]
+    assert results[0]["recommendations"]
+
+
+def test_blank_csv_semester_is_an_error(tmp_path):
+    path = tmp_path / "students.csv"
+    path.write_text("student_id,cgpa,passed,failed,semester\ns1,3.0,,,\ns2,3.0,,,fall\n",
+                    encoding="utf-8")
+
+    blank, fall = advise_batch(read_student_records(str(path)), workers=1)
+    assert blank == {"student_id": "s1", "error": "ValueError: semester is empty"}
+    assert fall["semester"] == "Fall" and fall["recommendations"]
@@ -0,0 +1,73 @@
+# tests/test_what_if.py
+
+import random
+
+import pytest
+
+from advising import SELECTION_MODES, AdvisingPipeline, recommendation_row
+from catalog import LEVELS, PLAN_SEMESTERS, Catalog, get_catalog
+from inference_engine import advise_student
+from test_advising_equivalence import student_corpus
+from what_if import apply_variant, sweep
+
+
+def variants_for(passed, failed, semester, rng):
+    """Single and combined changes of every kind to one profile"""
+    other = "Spring" if semester == "Fall" else "Fall"
+    changes = [{"semester": other}, {"cgpa": 1.5}, {"cgpa": 2.5}, {"cgpa": 3.5}]
+    changes += [{"pass": [code]} for code in failed]
+    changes += [{"fail": [code]} for code in rng.sample(passed, min(4, len(passed)))]
+    changes += [{"drop": [code]} for code in rng.sample(passed, min(2, len(passed)))]
+    return changes + [dict(first, **second) for first, second in zip(changes, changes[1:])]
+
+
+@pytest.mark.parametrize("selection", SELECTION_MODES)
+def test_sweep_matches_advise_student(selection):
+    rng = random.Random(0)
+    for cgpa, passed, failed, semester in student_corpus(60, seed=1):
+        variants = variants_for(passed, failed, semester, rng)
+        result = sweep(cgpa, passed, failed, semester, variants, selection)
+
+        assert (result["baseline"]["recommendations"], result["baseline"]["explanations"]) == \
+            advise_student(cgpa, passed, failed, semester, selection=selection)
+        for variant, outcome in zip(variants, result["variants"]):
+            expected = advise_student(*apply_variant(cgpa, passed, failed, semester, variant),
+                                      selection=selection)
+            assert (outcome["recommendations"], outcome["explanations"]) == expected, variant
+
+
+def tie_catalog():
+    """X (failed, zero-credit) and Y (core, long chain) both score 1160; X comes first"""
+    courses = {
+        "X": {"code": "X", "name": "X", "credits": 0, "type": "zero_credit",
+              "semester_offered": ["Fall"]}
+    }
+    prereqs = []
+    for n in range(1, 7):
+        code = f"P{n}"
+        courses[code] = {"code": code, "name": code, "credits": 1, "type": "core",
+                         "semester_offered": ["Spring"], "prerequisites": prereqs[-1:]}
+        prereqs.append(code)
+    courses["Y"] = {"code": "Y", "name": "Y", "credits": 6, "type": "core",
+                    "semester_offered": ["Fall"], "prerequisites": ["P6"]}
+
+    # X sits in level 4, so a level 1 student gets no level points for it
+    study_plan = {level: {semester: {"courses": []} for semester in PLAN_SEMESTERS}
+                  for level in LEVELS}
+    study_plan["level_4"]["fall"]["courses"].append({"code": "X", "type": "zero_credit", "credits": 0})
+    return Catalog(courses, get_catalog().policies, study_plan, version="tie")
+
+
+def test_sweep_breaks_failed_course_ties_in_catalog_order():
+    catalog = tie_catalog()
+    passed = [f"P{n}" for n in range(1, 7)]
+    pipeline = AdvisingPipeline()
+    pipeline.catalog = catalog
+    selected = pipeline.run_pipeline(3.5, passed, ["X"], "Fall")
+    scores = pipeline._get_course_priorities(selected, pipeline._context)
+    assert [course.code for course in selected] == ["X", "Y"]
+    assert scores == [1160, 1160]
+
+    result = sweep(3.5, passed, ["X"], "Fall", [{"pass": ["X"]}], catalog=catalog)
+    assert result["baseline"]["recommendations"] == [recommendation_row(c, catalog) for c in selected]
+    assert result["baseline"]["explanations"] == pipeline._generate_explanations(selected, pipeline._context)